@@ -38,6 +38,9 @@ async def init_sample_kb():
         except Exception as e:
             print(f"✗ Failed to ingest {doc_file.name}: {e}")
 
+    # Chunks are buffered across documents; write whatever is left
+    written = await kb_ingestion_service.flush(DEFAULT_TENANT_ID)
+    print(f"Flushed {written} buffered chunks")
     print(f"\nSample knowledge base initialized for tenant: {DEFAULT_TENANT_ID}")
 
 
@@ -180,7 +180,7 @@ async def troubleshooting_node(state: SupportTicketState) -> dict[str, Any]:
                 query=last_user_message,
             )
             if kb_chunks:
-                kb_context = await kb_retrieval_service.format_context_for_prompt(kb_chunks)
+                kb_context = kb_retrieval_service.format_context_for_prompt(kb_chunks)
                 for chunk in kb_chunks:
                     doc_name = chunk.get("metadata", {}).get(
                         "document_name", "Unknown")
@@ -340,8 +340,7 @@ Respond: One step if technical issue. Answer if question. Next step if confirmed
         try:
             import asyncio
             asyncio.create_task(
-                asyncio.to_thread(
-                    conversation_logger.log_conversation,
+                conversation_logger.log_conversation(
                     call_sid=call_sid,
                     messages=messages + [AIMessage(content=agent_response)],
                     qualification_data=ticket_data,
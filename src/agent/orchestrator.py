@@ -159,8 +159,7 @@ class SupportOrchestrator:
             try:
                 import asyncio
                 asyncio.create_task(
-                    asyncio.to_thread(
-                        conversation_logger.log_conversation,
+                    conversation_logger.log_conversation(
                         call_sid=call_sid,
                         messages=messages,
                         qualification_data=ticket_data,  # Reusing field name for compatibility
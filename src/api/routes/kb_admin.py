@@ -8,7 +8,7 @@ from pydantic import BaseModel
 
 from src.core.logging import get_logger
 from src.services.kb_ingestion import kb_ingestion_service
-from src.services.vector_store import vector_store
+from src.services.vector_store import get_vector_store
 
 logger = get_logger(__name__)
 
@@ -61,6 +61,7 @@ async def upload_document(
             category=category,
             tags=tag_list,
         )
+        await kb_ingestion_service.flush(tenant_id)
 
         file_path.unlink()
 
@@ -90,6 +91,7 @@ async def ingest_text(request: IngestTextRequest):
             category=request.category,
             tags=request.tags,
         )
+        await kb_ingestion_service.flush(request.tenant_id)
 
         return {"status": "success", **result}
 
@@ -110,7 +112,7 @@ async def get_kb_stats(tenant_id: str):
         KB statistics
     """
     try:
-        stats = vector_store.get_collection_stats(tenant_id)
+        stats = await get_vector_store().aget_collection_stats(tenant_id)
         return {"status": "success", **stats}
 
     except Exception as e:
@@ -130,7 +132,7 @@ async def delete_tenant_kb(tenant_id: str):
         Deletion result
     """
     try:
-        vector_store.delete_collection(tenant_id)
+        await get_vector_store().adelete_collection(tenant_id)
         return {"status": "success", "message": f"Deleted KB for tenant {tenant_id}"}
 
     except Exception as e:
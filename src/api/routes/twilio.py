@@ -1,14 +1,21 @@
 """Twilio webhook routes."""
 
+import asyncio
+import time
 import uuid
+from collections import OrderedDict
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Form, Request, Response
+from fastapi.responses import StreamingResponse
 from twilio.request_validator import RequestValidator
 from twilio.twiml.voice_response import VoiceResponse
 
 from src.core.config import settings
 from src.core.logging import get_logger
-from src.services.twilio_service import twilio_service
+from src.services.twilio_service import TERMINAL_CALL_STATUSES, say_twiml, twilio_service
 from src.services.tts_service import tts_service
+from src.services.conversation_logger import conversation_logger
 from src.agent.orchestrator import support_orchestrator
 
 logger = get_logger(__name__)
@@ -17,6 +24,30 @@ router = APIRouter(prefix="/twilio", tags=["twilio"])
 
 _audio_cache: dict[str, bytes] = {}
 
+# Long replies kept until their stream completes (or they expire), so a retried
+# fetch of the same URL can be served again
+PENDING_AUDIO_TTL = 300.0  # seconds
+PENDING_AUDIO_MAX = 1024
+PENDING_AUDIO_SWEEP_INTERVAL = 60.0  # seconds
+
+
+class PendingAudio:
+    """A long reply whose audio is streamed from /audio while it is synthesized."""
+
+    def __init__(self, text: str, first_chunk: bytes, stream: AsyncIterator[bytes]):
+        self.text = text
+        self.created_at = time.monotonic()
+        # The primed stream is handed to the first fetch; later fetches re-synthesize
+        self.primed: tuple[bytes, AsyncIterator[bytes]] | None = (first_chunk, stream)
+
+
+_pending_audio: OrderedDict[str, PendingAudio] = OrderedDict()
+
+
+# Constant error reply, rendered once at import
+TECHNICAL_DIFFICULTIES_TWIML = say_twiml(
+    "I'm sorry, I'm having technical difficulties. Please try again later.")
+
 
 def _build_base_url(request: Request) -> str:
     """Build base URL for audio and action endpoints."""
@@ -31,6 +62,81 @@ def _build_base_url(request: Request) -> str:
     return f"{scheme}://{host}"
 
 
+async def _prepare_audio_url(text: str, base_url: str) -> str:
+    """
+    Return a URL Twilio can <Play> for the given text.
+
+    Short texts (usually fixed prompts) are synthesized up front through the TTS
+    cache. Longer responses are streamed from /audio as ElevenLabs generates them,
+    so the TwiML is returned without waiting for the whole utterance; the first
+    chunk is read here so a failing TTS still surfaces before <Play> is returned.
+
+    Raises:
+        ValueError: If the audio could not be generated
+    """
+    audio_id = str(uuid.uuid4())
+    if len(text) >= tts_service.cache_max_text_length and tts_service.client:
+        stream = tts_service.generate_audio_stream_async(text)
+        try:
+            first_chunk = await anext(stream)
+        except StopAsyncIteration:
+            raise ValueError("Generated audio is empty") from None
+        await _prune_pending_audio()
+        _pending_audio[audio_id] = PendingAudio(text, first_chunk, stream)
+    else:
+        mp3_audio = await tts_service.generate_audio_async(text)
+        if not mp3_audio or len(mp3_audio) == 0:
+            raise ValueError("Generated audio is empty")
+        _audio_cache[audio_id] = mp3_audio
+    return f"{base_url}/api/v1/twilio/audio/{audio_id}"
+
+
+async def _prune_pending_audio() -> None:
+    """Drop expired pending replies and keep the map bounded."""
+    now = time.monotonic()
+    while _pending_audio:
+        pending = next(iter(_pending_audio.values()))
+        if now - pending.created_at < PENDING_AUDIO_TTL and len(_pending_audio) < PENDING_AUDIO_MAX:
+            break
+        _pending_audio.popitem(last=False)
+        if pending.primed is not None:
+            await pending.primed[1].aclose()
+
+
+async def sweep_pending_audio() -> None:
+    """Periodically expire pending replies that were never fetched (e.g. the caller hung up)."""
+    while True:
+        await asyncio.sleep(PENDING_AUDIO_SWEEP_INTERVAL)
+        try:
+            await _prune_pending_audio()
+        except Exception as e:
+            logger.warning("Failed to prune pending audio", error=str(e))
+
+
+async def _stream_pending_audio(audio_id: str, pending: PendingAudio) -> AsyncIterator[bytes]:
+    """Stream a pending reply, caching the full audio once it completes."""
+    if pending.primed is not None:
+        first_chunk, stream = pending.primed
+        pending.primed = None
+    else:
+        # Retry or parallel fetch: synthesize again from the kept text
+        first_chunk, stream = b"", tts_service.generate_audio_stream_async(pending.text)
+
+    chunks = [first_chunk] if first_chunk else []
+    try:
+        if first_chunk:
+            yield first_chunk
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+    finally:
+        await stream.aclose()
+
+    # Complete: later fetches of this URL are served from the cache
+    _audio_cache[audio_id] = b"".join(chunks)
+    _pending_audio.pop(audio_id, None)
+
+
 async def _validate_twilio_request(request: Request) -> bool:
     """Validate Twilio webhook signature."""
     form_data = await request.form()
@@ -96,14 +202,7 @@ async def handle_webhook(
             base_url = _build_base_url(request)
 
             try:
-                mp3_audio = tts_service.generate_audio(greeting)
-                if not mp3_audio or len(mp3_audio) == 0:
-                    raise ValueError("Generated audio is empty")
-
-                audio_id = str(uuid.uuid4())
-                _audio_cache[audio_id] = mp3_audio
-                audio_url = f"{base_url}/api/v1/twilio/audio/{audio_id}"
-                response.play(audio_url)
+                response.play(await _prepare_audio_url(greeting, base_url))
             except Exception as e:
                 logger.error("ElevenLabs TTS failed, using fallback",
                              call_sid=CallSid, error=str(e))
@@ -122,13 +221,11 @@ async def handle_webhook(
         except Exception as e:
             logger.error("Failed to handle initial call",
                          call_sid=CallSid, error=str(e), exc_info=True)
-            response = VoiceResponse()
-            response.say("I'm sorry, I'm having technical difficulties. Please try again later.",
-                         voice="alice", language="en-US")
-            return Response(content=str(response), media_type="application/xml")
+            return Response(content=TECHNICAL_DIFFICULTIES_TWIML, media_type="application/xml")
 
     elif CallStatus == "completed":
         twilio_service.handle_status_callback(CallSid, CallStatus)
+        await conversation_logger.finalize_conversation(CallSid)
 
     return Response(content="OK", status_code=200)
 
@@ -176,14 +273,7 @@ async def handle_response(
         base_url = _build_base_url(request)
 
         try:
-            mp3_audio = tts_service.generate_audio(agent_response)
-            if not mp3_audio or len(mp3_audio) == 0:
-                raise ValueError("Generated audio is empty")
-
-            audio_id = str(uuid.uuid4())
-            _audio_cache[audio_id] = mp3_audio
-            audio_url = f"{base_url}/api/v1/twilio/audio/{audio_id}"
-            response.play(audio_url)
+            response.play(await _prepare_audio_url(agent_response, base_url))
         except Exception as e:
             logger.error("ElevenLabs TTS failed, using fallback",
                          call_sid=CallSid, error=str(e))
@@ -205,10 +295,7 @@ async def handle_response(
     except Exception as e:
         logger.error("Failed to handle response",
                      call_sid=CallSid, error=str(e), exc_info=True)
-        response = VoiceResponse()
-        response.say("I'm sorry, I'm having technical difficulties. Please try again later.",
-                     voice="alice", language="en-US")
-        return Response(content=str(response), media_type="application/xml")
+        return Response(content=TECHNICAL_DIFFICULTIES_TWIML, media_type="application/xml")
 
 
 @router.post("/status")
@@ -229,12 +316,23 @@ async def handle_status_callback(
 
     duration = int(CallDuration) if CallDuration else None
     twilio_service.handle_status_callback(CallSid, CallStatus, duration)
+    if CallStatus in TERMINAL_CALL_STATUSES:
+        await conversation_logger.finalize_conversation(CallSid)
     return {"status": "ok"}
 
 
 @router.get("/audio/{audio_id}")
 async def serve_audio(audio_id: str):
     """Serve cached audio files generated by ElevenLabs TTS."""
+    await _prune_pending_audio()
+    pending = _pending_audio.get(audio_id)
+    if pending is not None and audio_id not in _audio_cache:
+        return StreamingResponse(
+            _stream_pending_audio(audio_id, pending),
+            media_type="audio/mpeg",
+            headers={"Cache-Control": "no-cache"},
+        )
+
     if audio_id not in _audio_cache:
         logger.warning("Audio file not found", audio_id=audio_id)
         return Response(content="Audio not found", status_code=404)
@@ -42,6 +42,9 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "qualifybot"
     POSTGRES_DB: str = "qualifybot"
     DATABASE_URL: str | None = None  # Railway provides this
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
 
     # Sentry
     SENTRY_DSN: str | None = None
@@ -49,11 +52,35 @@ class Settings(BaseSettings):
 
     # RAG / Knowledge Base
     CHROMA_PERSIST_DIR: str = "./vector_db"
+    CHROMA_HOST: str | None = None  # set to use a Chroma server instead of the local store
+    CHROMA_PORT: int = 8000
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     RAG_TOP_K: int = 3
     RAG_SIMILARITY_THRESHOLD: float = 0.7
     KB_CHUNK_SIZE: int = 1000
     KB_CHUNK_OVERLAP: int = 200
+    KB_EMBED_BATCH_SIZE: int = 256
+    KB_MAX_CONCURRENT_EMBEDS: int = 4
+    KB_UPSERT_BATCH_SIZE: int = 200
+    # HNSW index parameters for newly created tenant collections
+    KB_HNSW_SPACE: str = "ip"  # vectors are unit-normalized, so ip ranks like cosine
+    KB_HNSW_M: int = 24
+    KB_HNSW_CONSTRUCTION_EF: int = 200
+    KB_HNSW_SEARCH_EF: int = 100
+    KB_HNSW_NUM_THREADS: int | None = None  # defaults to CPU count
+    KB_QUERY_CACHE_SIZE: int = 1024
+    KB_QUERY_CACHE_TTL: float = 300.0  # seconds
+    # "tenant": one collection per tenant; "shared": small tenants share one
+    # collection filtered by tenant_id, except those listed in KB_DEDICATED_TENANTS
+    KB_SHARD_MODE: str = "tenant"
+    KB_DEDICATED_TENANTS: list[str] = []
+    KB_WARMUP_TENANTS: list[str] = []  # loaded at startup in addition to DEFAULT_TENANT_ID
+    KB_MAINTENANCE_INTERVAL: float = 3600.0  # seconds between empty-collection sweeps; 0 disables
+    # Large tenants served from Postgres/pgvector instead of Chroma
+    KB_PGVECTOR_TENANTS: list[str] = []
+    KB_PGVECTOR_DIMENSIONS: int = 1536  # must match EMBEDDING_MODEL
+    KB_PGVECTOR_CONSTRUCTION_EF: int = 128
+    KB_PGVECTOR_QUANT: str = "fp16"  # "fp16" (halfvec, pgvector >= 0.7) or "fp32" (vector)
 
     # Jira
     JIRA_SERVER: str = ""
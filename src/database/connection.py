@@ -1,17 +1,34 @@
 """Database connection setup."""
 
+import asyncio
+
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.core.config import settings
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values with orjson."""
+    return orjson.dumps(value).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.DEBUG,
     future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create session factory
@@ -44,7 +61,6 @@ async def get_db() -> AsyncSession:
 
 async def init_db() -> None:
     """Initialize database (create tables)."""
-    import asyncio
     from src.database.models import Base
 
     # Retry connection with exponential backoff
@@ -68,6 +84,23 @@ async def init_db() -> None:
                 raise
 
 
+async def warm_pool(size: int | None = None) -> None:
+    """
+    Open pooled connections up front so the first requests don't pay for them.
+
+    Args:
+        size: Number of connections to open (defaults to DB_POOL_SIZE)
+    """
+    size = size or settings.DB_POOL_SIZE
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(size)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    # Closing returns each connection to the pool rather than the server
+    await asyncio.gather(*(conn.close() for conn in opened))
+    logger.info("Database pool warmed", connections=len(opened), requested=size)
+
+
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
@@ -3,7 +3,9 @@
 import asyncio
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy import text
+from sqlalchemy.pool import NullPool
 from src.core.config import settings
+from src.database.models import SET_UPDATED_AT_FUNCTION, SUPPORT_TICKETS_UPDATED_AT_TRIGGER
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -11,7 +13,8 @@ logger = get_logger(__name__)
 
 async def apply_ticket_migrations():
     """Apply database migrations to create support_tickets table."""
-    engine = create_async_engine(settings.database_url)
+    # One-shot script: no need to keep a pool of idle connections around
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
     async with engine.begin() as conn:
         # Create support_tickets table
         await conn.execute(text("""
@@ -34,27 +37,65 @@ async def apply_ticket_migrations():
                 status VARCHAR(50) DEFAULT 'open' NOT NULL,
                 resolution TEXT,
                 kb_articles_used JSONB DEFAULT '[]',
-                resolved_at TIMESTAMP,
+                resolved_at TIMESTAMPTZ,
                 jira_ticket_key VARCHAR(100),
                 conversation_summary TEXT,
                 extra_data JSONB DEFAULT '{}',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+                created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL,
+                updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP NOT NULL
             )
         """))
-        
-        # Create indexes separately
+
+        # Tables created before the TIMESTAMPTZ switch keep naive columns under
+        # CREATE TABLE IF NOT EXISTS; convert them, treating stored values as UTC
+        for column in ("created_at", "updated_at", "resolved_at"):
+            await conn.execute(text(f"""
+                DO $$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'support_tickets'
+                          AND column_name = '{column}'
+                          AND data_type = 'timestamp without time zone'
+                    ) THEN
+                        ALTER TABLE support_tickets
+                            ALTER COLUMN {column} TYPE TIMESTAMPTZ
+                            USING {column} AT TIME ZONE 'UTC';
+                    END IF;
+                END $$
+            """))
+
+        # Keep updated_at current on every UPDATE
+        await conn.execute(text(SET_UPDATED_AT_FUNCTION))
+        await conn.execute(text(
+            "DROP TRIGGER IF EXISTS trg_support_tickets_updated_at ON support_tickets"
+        ))
+        await conn.execute(text(SUPPORT_TICKETS_UPDATED_AT_TRIGGER))
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
         indexes = [
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_ticket_id ON support_tickets(ticket_id)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_call_sid ON support_tickets(call_sid)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_session_id ON support_tickets(session_id)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_tenant_id ON support_tickets(tenant_id)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_from_number ON support_tickets(from_number)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_issue_type ON support_tickets(issue_type)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_severity ON support_tickets(severity)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_status ON support_tickets(status)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_jira_ticket_key ON support_tickets(jira_ticket_key)",
-            "CREATE INDEX IF NOT EXISTS ix_support_tickets_created_at ON support_tickets(created_at DESC)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_ticket_id ON support_tickets(ticket_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_call_sid ON support_tickets(call_sid)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_session_id ON support_tickets(session_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_tenant_id ON support_tickets(tenant_id)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_from_number ON support_tickets(from_number)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_issue_type ON support_tickets(issue_type)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_severity ON support_tickets(severity)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_status ON support_tickets(status)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_jira_ticket_key ON support_tickets(jira_ticket_key)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_created_at ON support_tickets(created_at DESC)",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_support_tickets_kb_gin ON support_tickets USING GIN (kb_articles_used jsonb_path_ops)",
+            # Analytics: open/escalated tickets per tenant over a time window
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_open ON support_tickets(tenant_id, created_at DESC) WHERE status = 'open'",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_escalated ON support_tickets(tenant_id, created_at DESC) WHERE status = 'escalated'",
+            # Covers the status/issue_type/severity breakdown for index-only scans
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_tenant_created_breakdown ON support_tickets(tenant_id, created_at DESC, status, issue_type, severity)",
+            # Caller history: equality on tenant/number, range + ORDER BY on created_at
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_st_caller_hist ON support_tickets(tenant_id, from_number, created_at) INCLUDE (status, issue_type)",
+            # Tickets by phone across tenants, ORDER BY created_at DESC without a sort
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_st_phone_created ON support_tickets(from_number, created_at)",
         ]
         
         for index_sql in indexes:
@@ -2,10 +2,28 @@
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Integer, String, Text, DateTime, Float
+from sqlalchemy import DDL, FetchedValue, Index, Integer, String, Text, DateTime, Float, event, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+# Postgres has no ON UPDATE clause, so updated_at is maintained by a trigger
+SET_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SUPPORT_TICKETS_UPDATED_AT_TRIGGER = """
+CREATE TRIGGER trg_support_tickets_updated_at
+BEFORE UPDATE ON support_tickets
+FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+"""
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
 
@@ -16,6 +34,17 @@ class SupportTicket(Base):
     """IT support ticket record."""
 
     __tablename__ = "support_tickets"
+    # Fetch server-generated timestamps via RETURNING instead of lazy loads
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Caller history lookups; INCLUDE keeps the aggregates index-only
+        Index(
+            "ix_st_caller_hist", "tenant_id", "from_number", "created_at",
+            postgresql_include=["status", "issue_type"],
+        ),
+        # Tickets by phone without a tenant filter, newest first (backward scan)
+        Index("ix_st_phone_created", "from_number", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True)
@@ -37,9 +66,9 @@ class SupportTicket(Base):
         String(20), nullable=True, index=True)
     priority_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
     affected_systems: Mapped[list[str]] = mapped_column(
-        JSON, nullable=True, default=list)
+        JSONB, nullable=True, default=list)
     error_messages: Mapped[list[str]] = mapped_column(
-        JSON, nullable=True, default=list)
+        JSONB, nullable=True, default=list)
     user_environment: Mapped[str | None] = mapped_column(
         String(200), nullable=True)
     steps_to_reproduce: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -50,9 +79,9 @@ class SupportTicket(Base):
         String(50), default="open", nullable=False, index=True)
     resolution: Mapped[str | None] = mapped_column(Text, nullable=True)
     kb_articles_used: Mapped[list[str]] = mapped_column(
-        JSON, nullable=True, default=list)
+        JSONB, nullable=True, default=list)
     resolved_at: Mapped[datetime | None] = mapped_column(
-        DateTime, nullable=True)
+        DateTime(timezone=True), nullable=True)
 
     # External integration
     jira_ticket_key: Mapped[str | None] = mapped_column(
@@ -61,16 +90,23 @@ class SupportTicket(Base):
                                  None] = mapped_column(Text, nullable=True)
 
     # Renamed from 'metadata' (SQLAlchemy reserved)
-    extra_data: Mapped[dict] = mapped_column(JSON, nullable=True, default=dict)
+    extra_data: Mapped[dict] = mapped_column(JSONB, nullable=True, default=dict)
 
-    # Timestamps
+    # Timestamps (set by Postgres; updated_at is maintained by a trigger)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False)
+        DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime(timezone=True), server_default=func.now(),
+        server_onupdate=FetchedValue(), nullable=False
     )
 
 
+event.listen(SupportTicket.__table__, "after_create", DDL(SET_UPDATED_AT_FUNCTION))
+event.listen(
+    SupportTicket.__table__, "after_create", DDL(SUPPORT_TICKETS_UPDATED_AT_TRIGGER)
+)
+
+
 class CallHistory(Base):
     """Call history record."""
 
@@ -86,11 +122,12 @@ class CallHistory(Base):
     duration: Mapped[int | None] = mapped_column(Integer, nullable=True)
     transcript: Mapped[str | None] = mapped_column(Text, nullable=True)
     # Renamed from 'metadata' (SQLAlchemy reserved)
-    extra_data: Mapped[dict] = mapped_column(JSON, nullable=True, default=dict)
+    extra_data: Mapped[dict] = mapped_column(JSONB, nullable=True, default=dict)
 
     # Timestamps
     started_at: Mapped[datetime | None] = mapped_column(
-        DateTime, nullable=True)
-    ended_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+        DateTime(timezone=True), nullable=True)
+    ended_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False)
+        DateTime(timezone=True), server_default=func.now(), nullable=False)
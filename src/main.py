@@ -1,20 +1,46 @@
 """FastAPI application entry point."""
 
+import asyncio
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 
 from src.core.config import settings
 from src.core.logging import configure_logging, get_logger
 from src.api.routes import router
-from src.database.connection import init_db, close_db
-from src.agent.checkpoint import init_checkpointer, close_checkpointer
+from src.api.routes.twilio import sweep_pending_audio
+from src.database.connection import engine, init_db, close_db, warm_pool
+from src.agent.checkpoint import init_checkpointer, close_checkpointer, get_checkpointer
+from src.services.jira_service import jira_service
+from src.services.kb_ingestion import shutdown_pdf_executor
+from src.services.llm_service import llm_service
+from src.services.embedding_service import embedding_service
+from src.services.session_manager import session_manager
+from src.services.vector_store import get_vector_store
 
 # Configure logging
 configure_logging()
 logger = get_logger(__name__)
 
+# Readiness probes fire every few seconds; reuse the last result briefly
+READINESS_CACHE_TTL = 5.0
+_readiness_cache: tuple[float, dict] | None = None
+
+
+async def _vector_store_maintenance() -> None:
+    """Periodically drop empty tenant collections."""
+    while True:
+        await asyncio.sleep(settings.KB_MAINTENANCE_INTERVAL)
+        try:
+            dropped = await asyncio.to_thread(get_vector_store().drop_empty_collections)
+            if dropped:
+                logger.info("Vector store maintenance completed", dropped_collections=dropped)
+        except Exception as e:
+            logger.error("Vector store maintenance failed", error=str(e))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -23,6 +49,7 @@ async def lifespan(app: FastAPI):
     logger.info("Starting QualifyBot API")
     try:
         await init_db()
+        await warm_pool()
     except Exception as e:
         logger.error("Failed to initialize database", error=str(e), exc_info=True)
         # Don't fail startup - health check will show degraded status
@@ -32,12 +59,33 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error("Failed to initialize checkpointer", error=str(e), exc_info=True)
         # Don't fail startup - will fall back to memory checkpointer
+
+    try:
+        await session_manager.connect()
+    except Exception as e:
+        logger.error("Failed to connect to Redis", error=str(e), exc_info=True)
+        # Don't fail startup - the pool reconnects on first use
+
+    # Pay the HNSW load cost now rather than on each tenant's first call
+    await asyncio.to_thread(
+        get_vector_store().warmup,
+        dict.fromkeys([settings.DEFAULT_TENANT_ID, *settings.KB_WARMUP_TENANTS]),
+    )
     
+    maintenance_task = None
+    if settings.KB_MAINTENANCE_INTERVAL > 0:
+        maintenance_task = asyncio.create_task(_vector_store_maintenance())
+    pending_audio_task = asyncio.create_task(sweep_pending_audio())
+
     logger.info("QualifyBot API started")
 
     yield
 
     logger.info("Shutting down QualifyBot API")
+    if maintenance_task is not None:
+        maintenance_task.cancel()
+    pending_audio_task.cancel()
+
     try:
         await close_checkpointer()
     except Exception as e:
@@ -47,6 +95,31 @@ async def lifespan(app: FastAPI):
         await close_db()
     except Exception as e:
         logger.error("Error closing database", error=str(e))
+
+    try:
+        await jira_service.close()
+    except Exception as e:
+        logger.error("Error closing Jira client", error=str(e))
+
+    try:
+        await llm_service.close()
+    except Exception as e:
+        logger.error("Error closing LLM client", error=str(e))
+
+    try:
+        await embedding_service.close()
+    except Exception as e:
+        logger.error("Error closing embedding client", error=str(e))
+
+    try:
+        await session_manager.disconnect()
+    except Exception as e:
+        logger.error("Error closing Redis session pool", error=str(e))
+
+    try:
+        await asyncio.to_thread(shutdown_pdf_executor)
+    except Exception as e:
+        logger.error("Error shutting down PDF extraction pool", error=str(e))
     
     logger.info("QualifyBot API shut down")
 
@@ -58,13 +131,6 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log incoming requests."""
-    response = await call_next(request)
-    return response
-
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -96,9 +162,12 @@ async def readiness_check():
     
     Checks if all required services (database, Redis) are connected.
     """
-    from src.database.connection import engine
-    from src.agent.checkpoint import get_checkpointer
-    
+    global _readiness_cache
+
+    now = time.monotonic()
+    if _readiness_cache is not None and now - _readiness_cache[0] < READINESS_CACHE_TTL:
+        return _readiness_cache[1]
+
     checks = {
         "status": "ready",
         "database": "unknown",
@@ -108,8 +177,10 @@ async def readiness_check():
     # Check database connection
     try:
         # Test database connection by executing a simple query
-        from sqlalchemy import text
-        async with engine.begin() as conn:
+        # AUTOCOMMIT: the asyncpg adapter otherwise wraps even a bare SELECT in
+        # BEGIN ... ROLLBACK, tripling the round-trips of every probe
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
             await conn.execute(text("SELECT 1"))
         checks["database"] = "connected"
     except Exception as e:
@@ -129,6 +200,7 @@ async def readiness_check():
         checks["status"] = "degraded"
     
     status_code = 200 if checks["status"] == "ready" else 503
+    _readiness_cache = (now, checks)
     return checks
 
 
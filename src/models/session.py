@@ -1,10 +1,11 @@
 """Session data models."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, Field, field_serializer, field_validator
 
 
 class SessionState(str, Enum):
@@ -50,29 +51,37 @@ class SessionData(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     metadata: dict[str, Any] = Field(default_factory=dict)
 
+    @field_serializer("created_at", "updated_at")
+    def _serialize_timestamp(self, value: datetime) -> int:
+        """Store timestamps as integer epoch milliseconds (naive values are UTC)."""
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return int(value.timestamp() * 1000)
+
+    @field_validator("created_at", "updated_at", mode="before")
+    @classmethod
+    def _parse_timestamp(cls, value: Any) -> Any:
+        """Accept epoch milliseconds; ISO strings from older payloads still parse."""
+        if isinstance(value, int | float):
+            return datetime.fromtimestamp(value / 1000, UTC).replace(tzinfo=None)
+        return value
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for Redis storage."""
-        return {
-            "session_id": self.session_id,
-            "call_sid": self.call_sid,
-            "from_number": self.from_number,
-            "to_number": self.to_number,
-            "state": self.state.value,
-            "qualification_data": self.qualification_data.model_dump(),
-            "conversation_history": self.conversation_history,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "metadata": self.metadata,
-        }
+        # model_dump_json runs in pydantic-core and already emits enum values
+        # and epoch-ms timestamps, so no per-field casting is needed here
+        return orjson.loads(self.model_dump_json())
+
+    def to_json(self) -> bytes:
+        """Serialize to JSON bytes for direct Redis storage."""
+        return self.model_dump_json().encode()
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "SessionData":
         """Create from dictionary."""
-        data["state"] = SessionState(data["state"])
-        data["qualification_data"] = QualificationData(**data["qualification_data"])
-        data["created_at"] = datetime.fromisoformat(data["created_at"])
-        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
-        return cls(**data)
-
-
+        return cls.model_validate(data)
 
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "SessionData":
+        """Create from JSON bytes read from Redis."""
+        return cls.model_validate_json(data)
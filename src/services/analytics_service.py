@@ -1,9 +1,8 @@
 """Analytics service for tracking conversation and ticket metrics."""
 
-from datetime import datetime, timedelta
+from datetime import UTC, datetime, timedelta
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, text
 
 from src.database.models import SupportTicket
 from src.database.connection import AsyncSessionLocal
@@ -11,6 +10,19 @@ from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+_KB_USAGE_SQL = """
+    SELECT elem, count(*) AS uses
+    FROM support_tickets,
+         jsonb_array_elements_text(
+             CASE WHEN jsonb_typeof(kb_articles_used) = 'array'
+                  THEN kb_articles_used ELSE '[]'::jsonb END
+         ) AS elem
+    WHERE created_at >= :cutoff{tenant_filter}
+    GROUP BY elem
+    ORDER BY uses DESC
+    LIMIT 10
+"""
+
 
 class AnalyticsService:
     """Service for tracking and analyzing conversation metrics."""
@@ -32,42 +44,61 @@ class AnalyticsService:
         """
         try:
             async with AsyncSessionLocal() as session:
-                cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-                stmt = select(SupportTicket).where(
+                cutoff_date = datetime.now(UTC) - timedelta(days=days)
+
+                # Only project the columns the metrics need; avoids hydrating
+                # full ORM entities and detoasting large TEXT columns
+                stmt = select(
+                    SupportTicket.status,
+                    SupportTicket.issue_type,
+                    SupportTicket.severity,
+                ).where(
                     SupportTicket.created_at >= cutoff_date
                 )
                 if tenant_id:
                     stmt = stmt.where(SupportTicket.tenant_id == tenant_id)
 
-                result = await session.execute(stmt)
-                tickets = list(result.scalars().all())
-
-                total_tickets = len(tickets)
-                resolved = sum(1 for t in tickets if t.status == "resolved")
-                escalated = sum(1 for t in tickets if t.status == "escalated")
-                open_tickets = sum(1 for t in tickets if t.status == "open")
+                # Server-side cursor: rows are folded into the counters as
+                # they arrive instead of materializing the whole window
+                result = await session.stream(stmt.execution_options(yield_per=500))
 
-                # Issue type breakdown
+                total_tickets = 0
+                resolved = 0
+                escalated = 0
+                open_tickets = 0
                 issue_types = {}
-                for ticket in tickets:
-                    issue_type = ticket.issue_type or "unknown"
+                severity_counts = {}
+
+                async for status, issue_type, severity in result:
+                    total_tickets += 1
+                    if status == "resolved":
+                        resolved += 1
+                    elif status == "escalated":
+                        escalated += 1
+                    elif status == "open":
+                        open_tickets += 1
+
+                    # Issue type breakdown
+                    issue_type = issue_type or "unknown"
                     issue_types[issue_type] = issue_types.get(
                         issue_type, 0) + 1
 
-                # Severity breakdown
-                severity_counts = {}
-                for ticket in tickets:
-                    severity = ticket.severity or "unknown"
+                    # Severity breakdown
+                    severity = severity or "unknown"
                     severity_counts[severity] = severity_counts.get(
                         severity, 0) + 1
 
-                # KB articles usage
-                kb_articles_used = {}
-                for ticket in tickets:
-                    for article in ticket.kb_articles_used or []:
-                        kb_articles_used[article] = kb_articles_used.get(
-                            article, 0) + 1
+                # KB articles usage (top 10), aggregated in Postgres
+                kb_params = {"cutoff": cutoff_date}
+                tenant_filter = ""
+                if tenant_id:
+                    tenant_filter = " AND tenant_id = :tenant_id"
+                    kb_params["tenant_id"] = tenant_id
+                kb_result = await session.execute(
+                    text(_KB_USAGE_SQL.format(tenant_filter=tenant_filter)),
+                    kb_params,
+                )
+                kb_articles_used = {article: uses for article, uses in kb_result.all()}
 
                 resolution_rate = (resolved / total_tickets *
                                    100) if total_tickets > 0 else 0
@@ -84,7 +115,7 @@ class AnalyticsService:
                     "escalation_rate": round(escalation_rate, 2),
                     "issue_types": issue_types,
                     "severity_breakdown": severity_counts,
-                    "kb_articles_usage": dict(sorted(kb_articles_used.items(), key=lambda x: x[1], reverse=True)[:10]),
+                    "kb_articles_usage": kb_articles_used,
                 }
         except Exception as e:
             logger.error("Failed to get conversation metrics", error=str(e))
@@ -120,23 +151,26 @@ class AnalyticsService:
         """
         try:
             async with AsyncSessionLocal() as session:
-                cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-                stmt = select(SupportTicket).where(
+                cutoff_date = datetime.now(UTC) - timedelta(days=days)
+
+                # Truncate the description server-side so only the 50-char
+                # prefix used for grouping crosses the wire
+                stmt = select(
+                    SupportTicket.issue_type,
+                    func.substr(SupportTicket.issue_description, 1, 50),
+                ).where(
                     SupportTicket.created_at >= cutoff_date
                 )
                 if tenant_id:
                     stmt = stmt.where(SupportTicket.tenant_id == tenant_id)
 
-                result = await session.execute(stmt)
-                tickets = list(result.scalars().all())
+                result = await session.stream(stmt.execution_options(yield_per=500))
 
                 issue_counts = {}
-                for ticket in tickets:
-                    issue_type = ticket.issue_type or "unknown"
-                    issue_desc = ticket.issue_description or ""
+                async for issue_type, issue_desc in result:
+                    issue_type = issue_type or "unknown"
 
-                    key = f"{issue_type}: {issue_desc[:50]}" if issue_desc else issue_type
+                    key = f"{issue_type}: {issue_desc}" if issue_desc else issue_type
                     issue_counts[key] = issue_counts.get(key, 0) + 1
 
                 sorted_issues = sorted(
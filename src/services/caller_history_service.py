@@ -1,10 +1,17 @@
 """Service for retrieving caller history and personalization."""
 
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import pickle
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, tuple_
+from sqlalchemy.orm import aliased
 
+from src.core.config import settings
 from src.database.models import SupportTicket
 from src.database.connection import AsyncSessionLocal
 from src.core.logging import get_logger
@@ -29,9 +36,129 @@ class CallerHistory:
         self.common_issue_types = common_issue_types or []
 
 
+HistoryKey = tuple[str, str, int]  # (from_number, tenant_id, days)
+
+
+class CallerHistoryBatcher:
+    """Coalesces concurrent history lookups into one query per short window."""
+
+    def __init__(
+        self,
+        loader: Callable[[list[HistoryKey]], Awaitable[dict[HistoryKey, CallerHistory]]],
+        max_batch_size: int = 64,
+        window_seconds: float = 0.005,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            loader: Coroutine resolving a list of keys to their histories
+            max_batch_size: Maximum number of keys per query
+            window_seconds: How long to wait for more lookups before querying
+        """
+        self._loader = loader
+        self.max_batch_size = max_batch_size
+        self.window_seconds = window_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def load(self, key: HistoryKey) -> CallerHistory:
+        """
+        Queue a lookup and wait for its batch to resolve.
+
+        Args:
+            key: (from_number, tenant_id, days)
+
+        Returns:
+            CallerHistory for the key
+        """
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self._queue.put_nowait((key, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window_seconds)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[tuple[HistoryKey, asyncio.Future]]) -> None:
+        waiters: dict[HistoryKey, list[asyncio.Future]] = defaultdict(list)
+        for key, future in batch:
+            waiters[key].append(future)
+
+        try:
+            results = await self._loader(list(waiters))
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in waiters.items():
+            history = results.get(key) or CallerHistory()
+            for future in futures:
+                if not future.done():
+                    future.set_result(history)
+
+
 class CallerHistoryService:
     """Service for retrieving and analyzing caller history."""
 
+    def __init__(self):
+        """Initialize the history cache."""
+        # Separate client: cached values are pickled bytes, not utf-8 text
+        self.redis_client: redis.Redis | None = None
+        self.cache_ttl = 60  # seconds
+        self._batcher = CallerHistoryBatcher(self._load_caller_histories)
+
+    async def connect(self) -> None:
+        """Connect to Redis."""
+        if not self.redis_client:
+            self.redis_client = await redis.from_url(settings.redis_url)
+
+    @staticmethod
+    def _cache_key(tenant_id: str, from_number: str, days: int) -> str:
+        return f"ch:{tenant_id}:{from_number}:{days}"
+
+    @staticmethod
+    def _index_key(tenant_id: str, from_number: str) -> str:
+        """Set of a caller's cached history keys, so invalidation needs no SCAN."""
+        return f"chidx:{tenant_id}:{from_number}"
+
+    async def invalidate(self, from_number: str, tenant_id: str = "default") -> None:
+        """
+        Drop cached history for a caller (all lookback windows).
+
+        Args:
+            from_number: Caller's phone number
+            tenant_id: Tenant identifier
+        """
+        index_key = self._index_key(tenant_id, from_number)
+        try:
+            await self.connect()
+            keys = await self.redis_client.smembers(index_key)
+            await self.redis_client.delete(index_key, *keys)
+        except Exception as e:
+            logger.warning("Failed to invalidate caller history cache",
+                           from_number=from_number, error=str(e))
+
     async def get_caller_history(
         self,
         from_number: str,
@@ -39,7 +166,7 @@ class CallerHistoryService:
         days: int = 90,
     ) -> CallerHistory:
         """
-        Get caller history for personalization.
+        Get caller history for personalization, served from Redis when cached.
 
         Args:
             from_number: Caller's phone number
@@ -49,55 +176,154 @@ class CallerHistoryService:
         Returns:
             CallerHistory object with caller information
         """
+        key = self._cache_key(tenant_id, from_number, days)
         try:
-            async with AsyncSessionLocal() as session:
-                cutoff_date = datetime.utcnow() - timedelta(days=days)
-                
-                stmt = select(SupportTicket).where(
-                    and_(
-                        SupportTicket.from_number == from_number,
-                        SupportTicket.tenant_id == tenant_id,
-                        SupportTicket.created_at >= cutoff_date
-                    )
-                ).order_by(SupportTicket.created_at.desc())
-                
-                result = await session.execute(stmt)
-                tickets = list(result.scalars().all())
-
-                if not tickets:
-                    return CallerHistory()
-
-                # Analyze tickets
-                resolved_issues = []
-                issue_types = {}
-                
-                for ticket in tickets:
-                    if ticket.status == "resolved" and ticket.issue_description:
-                        resolved_issues.append(ticket.issue_description[:100])
-                    
-                    issue_type = ticket.issue_type or "unknown"
-                    issue_types[issue_type] = issue_types.get(issue_type, 0) + 1
-
-                # Get most common issue types
-                common_issue_types = sorted(
-                    issue_types.items(), key=lambda x: x[1], reverse=True
-                )[:3]
-                common_issue_types = [issue_type for issue_type, _ in common_issue_types]
-
-                last_call_date = tickets[0].created_at if tickets else None
-
-                return CallerHistory(
-                    total_calls=len(tickets),
-                    recent_tickets=tickets[:5],  # Last 5 tickets
-                    last_call_date=last_call_date,
-                    resolved_issues=resolved_issues[:3],  # Last 3 resolved issues
-                    common_issue_types=common_issue_types,
-                )
+            await self.connect()
+            cached = await self.redis_client.get(key)
+            if cached:
+                return pickle.loads(cached)
+        except Exception as e:
+            logger.warning("Caller history cache read failed", error=str(e))
+
+        try:
+            history = await self._batcher.load((from_number, tenant_id, days))
         except Exception as e:
             logger.error("Failed to get caller history",
                         from_number=from_number, error=str(e))
             return CallerHistory()
 
+        try:
+            index_key = self._index_key(tenant_id, from_number)
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, pickle.dumps(history), ex=self.cache_ttl)
+                pipe.sadd(index_key, key)
+                pipe.expire(index_key, self.cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Caller history cache write failed", error=str(e))
+        return history
+
+    async def _load_caller_histories(
+        self,
+        keys: list[HistoryKey],
+    ) -> dict[HistoryKey, CallerHistory]:
+        """
+        Query caller history for a batch of callers.
+
+        Args:
+            keys: (from_number, tenant_id, days) tuples
+
+        Returns:
+            Mapping of key to CallerHistory; callers without tickets are omitted
+        """
+        by_days: dict[int, list[tuple[str, str]]] = defaultdict(list)
+        for from_number, tenant_id, days in keys:
+            by_days[days].append((from_number, tenant_id))
+
+        histories: dict[HistoryKey, CallerHistory] = {}
+        async with AsyncSessionLocal() as session:
+            for days, callers in by_days.items():
+                loaded = await self._query_histories(session, callers, days)
+                for (from_number, tenant_id), history in loaded.items():
+                    histories[(from_number, tenant_id, days)] = history
+        return histories
+
+    async def _query_histories(
+        self,
+        session: AsyncSession,
+        callers: list[tuple[str, str]],
+        days: int,
+    ) -> dict[tuple[str, str], CallerHistory]:
+        """Run the aggregate history queries for callers sharing a lookback window."""
+        cutoff_date = datetime.now(UTC) - timedelta(days=days)
+        conditions = and_(
+            tuple_(SupportTicket.from_number, SupportTicket.tenant_id).in_(callers),
+            SupportTicket.created_at >= cutoff_date,
+        )
+        caller_cols = (SupportTicket.from_number, SupportTicket.tenant_id)
+
+        # Five most recent tickets per caller, plus per-caller totals
+        ranked = (
+            select(
+                SupportTicket,
+                func.row_number().over(
+                    partition_by=caller_cols, order_by=SupportTicket.created_at.desc()
+                ).label("rn"),
+                func.count().over(partition_by=caller_cols).label("total"),
+            )
+            .where(conditions)
+            .subquery()
+        )
+        ticket = aliased(SupportTicket, ranked)
+        recent_stmt = (
+            select(ticket, ranked.c.total)
+            .where(ranked.c.rn <= 5)
+            .order_by(ranked.c.from_number, ranked.c.tenant_id, ranked.c.rn)
+        )
+        recent: dict[tuple[str, str], list[SupportTicket]] = defaultdict(list)
+        totals: dict[tuple[str, str], int] = {}
+        for row, total in (await session.execute(recent_stmt)).all():
+            caller = (row.from_number, row.tenant_id)
+            recent[caller].append(row)
+            totals[caller] = total
+
+        if not totals:
+            return {}
+
+        issue_type = func.coalesce(SupportTicket.issue_type, "unknown").label("issue_type")
+        common_stmt = (
+            select(
+                *caller_cols,
+                issue_type,
+                func.count().label("n"),
+                func.max(SupportTicket.created_at).label("latest"),
+            )
+            .where(conditions)
+            .group_by(*caller_cols, issue_type)
+        )
+        issue_counts: dict[tuple[str, str], list] = defaultdict(list)
+        for row in (await session.execute(common_stmt)).all():
+            issue_counts[(row.from_number, row.tenant_id)].append(row)
+
+        resolved_ranked = (
+            select(
+                *caller_cols,
+                func.substr(SupportTicket.issue_description, 1, 100).label("description"),
+                func.row_number().over(
+                    partition_by=caller_cols, order_by=SupportTicket.created_at.desc()
+                ).label("rn"),
+            )
+            .where(
+                conditions,
+                SupportTicket.status == "resolved",
+                SupportTicket.issue_description.isnot(None),
+                SupportTicket.issue_description != "",
+            )
+            .subquery()
+        )
+        resolved_stmt = (
+            select(resolved_ranked.c.from_number, resolved_ranked.c.tenant_id, resolved_ranked.c.description)
+            .where(resolved_ranked.c.rn <= 3)
+            .order_by(resolved_ranked.c.rn)
+        )
+        resolved: dict[tuple[str, str], list[str]] = defaultdict(list)
+        for row in (await session.execute(resolved_stmt)).all():
+            resolved[(row.from_number, row.tenant_id)].append(row.description)
+
+        histories = {}
+        for caller, total in totals.items():
+            top_issues = sorted(
+                issue_counts[caller], key=lambda r: (r.n, r.latest), reverse=True
+            )[:3]
+            histories[caller] = CallerHistory(
+                total_calls=total,
+                recent_tickets=recent[caller],
+                last_call_date=recent[caller][0].created_at,
+                resolved_issues=resolved[caller],
+                common_issue_types=[r.issue_type for r in top_issues],
+            )
+        return histories
+
     async def get_personalization_context(
         self,
         from_number: str,
@@ -121,7 +347,11 @@ class CallerHistoryService:
         context_parts = []
         
         if history.last_call_date:
-            days_ago = (datetime.utcnow() - history.last_call_date).days
+            last_call = history.last_call_date
+            if last_call.tzinfo is None:
+                # Naive values come from columns not yet migrated to TIMESTAMPTZ
+                last_call = last_call.replace(tzinfo=UTC)
+            days_ago = (datetime.now(UTC) - last_call).days
             if days_ago == 0:
                 context_parts.append("This caller called earlier today.")
             elif days_ago == 1:
@@ -1,10 +1,17 @@
 """Service for logging conversations to files with intelligent summaries."""
 
-import json
+import asyncio
+import io
+import weakref
+from collections import OrderedDict
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+import orjson
+from langchain_core.messages import AIMessage, HumanMessage
+
 from src.core.logging import get_logger
 from src.services.llm_service import llm_service
 
@@ -12,13 +19,84 @@ logger = get_logger(__name__)
 
 CONVERSATIONS_DIR = Path("conversations")
 
+# Above this size JSON (de)serialization is moved off the event loop
+JSON_OFFLOAD_THRESHOLD = 64 * 1024
+
+# Number of in-progress calls whose dedup state is kept in memory
+MAX_ACTIVE_CALLS = 256
+
+# Strong references to fire-and-forget summary tasks so they aren't GC'd mid-run
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _msg_type_and_content(msg: Any) -> tuple[str, Any]:
+    """Return (type, content) for a formatted dict or a LangChain message."""
+    if isinstance(msg, dict):
+        return msg.get("type", "unknown"), msg.get("content", "")
+    if isinstance(msg, HumanMessage):
+        msg_type = "human"
+    elif isinstance(msg, AIMessage):
+        msg_type = "ai"
+    else:
+        msg_type = "unknown"
+    return msg_type, getattr(msg, "content", str(msg))
+
+
+class _CallState:
+    """In-memory view of a call's transcript, rebuilt from disk on a miss."""
+
+    def __init__(self):
+        self.messages: list[dict] = []
+        # Content hashes; state is rebuilt per process, so hash() seeding is fine
+        self.seen_hashes: set[int] = set()
+        self.qualification_data: dict = {}
+        self.metadata: dict = {}
+        self.timestamp: str | None = None
+        # Rendered summary transcript covering messages[:summary_count]
+        self.summary_transcript = io.StringIO()
+        self.summary_count = 0
+        self.summary_human_count = 0
+
+    def add_message(self, message: dict) -> bool:
+        """Add a formatted message unless its content was already logged."""
+        content = message.get("content", "")
+        if not content:
+            return False
+        content_hash = hash(content)
+        if content_hash in self.seen_hashes:
+            return False
+        self.seen_hashes.add(content_hash)
+        self.messages.append(message)
+        return True
+
+    def apply(self, record: dict) -> None:
+        """Apply one transcript.jsonl record (a message or a `_state` update)."""
+        update = record.get("_state")
+        if update is None:
+            self.add_message(record)
+            return
+        self.qualification_data.update(update.get("qualification_data") or {})
+        self.metadata.update(update.get("metadata") or {})
+        self.timestamp = update.get("timestamp", self.timestamp)
+
 
 class ConversationLogger:
-    """Service for logging conversation transcripts to files."""
+    """Service for logging conversation transcripts to files.
+
+    Turns are appended to ``transcript.jsonl``; ``finalize_conversation``
+    compacts it into ``transcript.json`` once the call ends.
+    """
 
     def __init__(self, base_dir: Path = CONVERSATIONS_DIR):
         self.base_dir = base_dir
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._states: OrderedDict[str, _CallState] = OrderedDict()
+        # Bounds concurrent LLM summary requests across all calls
+        self._summary_sem = asyncio.Semaphore(4)
+        # Locks live only while a log/finalize for that call is in flight
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
 
     def _get_conversation_dir(self, call_sid: str) -> Path:
         """Get directory for a specific conversation."""
@@ -26,7 +104,75 @@ class ConversationLogger:
         conv_dir.mkdir(parents=True, exist_ok=True)
         return conv_dir
 
-    def log_conversation(
+    def _get_lock(self, call_sid: str) -> asyncio.Lock:
+        lock = self._locks.get(call_sid)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[call_sid] = lock
+        return lock
+
+    async def _read_json(self, path: Path) -> Any:
+        """Read and parse a JSON file, parsing off-loop when it is large."""
+        raw = await asyncio.to_thread(path.read_bytes)
+        if len(raw) > JSON_OFFLOAD_THRESHOLD:
+            return await asyncio.to_thread(orjson.loads, raw)
+        return orjson.loads(raw)
+
+    async def _read_jsonl(self, path: Path) -> list[dict]:
+        """Read transcript.jsonl records."""
+        raw = await asyncio.to_thread(path.read_bytes)
+        parse = partial(_parse_jsonl, raw)
+        if len(raw) > JSON_OFFLOAD_THRESHOLD:
+            return await asyncio.to_thread(parse)
+        return parse()
+
+    async def _load_state(self, conv_dir: Path) -> _CallState:
+        """Rebuild call state from a compacted transcript plus pending appends."""
+        state = _CallState()
+        transcript_file = conv_dir / "transcript.json"
+        jsonl_file = conv_dir / "transcript.jsonl"
+
+        if transcript_file.exists():
+            data = await self._read_json(transcript_file)
+            for message in data.get("messages", []):
+                state.add_message(message)
+            state.apply({"_state": {
+                "qualification_data": data.get("qualification_data"),
+                "metadata": data.get("metadata"),
+                "timestamp": data.get("timestamp"),
+            }})
+        if jsonl_file.exists():
+            for record in await self._read_jsonl(jsonl_file):
+                state.apply(record)
+        return state
+
+    async def _get_state(self, call_sid: str, conv_dir: Path) -> _CallState:
+        state = self._states.get(call_sid)
+        if state is not None:
+            self._states.move_to_end(call_sid)
+            return state
+
+        try:
+            state = await self._load_state(conv_dir)
+            if state.messages:
+                logger.info("Loaded existing conversation", call_sid=call_sid,
+                            existing_message_count=len(state.messages))
+        except Exception as e:
+            logger.warning("Failed to load existing transcript",
+                           call_sid=call_sid, error=str(e))
+            state = _CallState()
+
+        self._states[call_sid] = state
+        while len(self._states) > MAX_ACTIVE_CALLS:
+            self._states.popitem(last=False)
+        return state
+
+    @staticmethod
+    def _append(path: Path, data: bytes) -> None:
+        with open(path, "ab") as f:
+            f.write(data)
+
+    async def log_conversation(
         self,
         call_sid: str,
         messages: list[Any],
@@ -34,7 +180,7 @@ class ConversationLogger:
         metadata: dict | None = None,
     ) -> dict[str, str]:
         """
-        Log conversation to files - merges with existing conversation to preserve all messages.
+        Log conversation to files - appends only messages not already logged for this call.
 
         Args:
             call_sid: Call SID
@@ -48,121 +194,57 @@ class ConversationLogger:
         try:
             conv_dir = self._get_conversation_dir(call_sid)
             timestamp = datetime.utcnow().isoformat()
-            transcript_file = conv_dir / "transcript.json"
-
-            # Load existing messages if file exists
-            existing_messages = []
-            existing_qualification_data = {}
-            if transcript_file.exists():
-                try:
-                    with open(transcript_file, "r", encoding="utf-8") as f:
-                        existing_data = json.load(f)
-                        existing_messages = existing_data.get("messages", [])
-                        existing_qualification_data = existing_data.get(
-                            "qualification_data", {})
-                        logger.info("Loaded existing conversation", call_sid=call_sid,
-                                    existing_message_count=len(existing_messages))
-                except Exception as e:
-                    logger.warning("Failed to load existing transcript",
-                                   call_sid=call_sid, error=str(e))
-
-            # Extract new message content properly
-            new_formatted_messages = []
-            seen_contents = set()  # Track seen messages to avoid duplicates
-
-            # Add existing messages to seen set
-            for existing_msg in existing_messages:
-                content = existing_msg.get("content", "")
-                if content:
-                    seen_contents.add(content)
-
-            # Process new messages and add only if not seen
-            for msg in messages:
-                # Determine message type - check for HumanMessage first
-                if isinstance(msg, dict):
-                    msg_type = msg.get("type", "unknown")
-                    content = msg.get("content", "")
-                else:
-                    # Check if it's a HumanMessage or AIMessage
-                    msg_class_str = str(type(msg))
-                    if "HumanMessage" in msg_class_str:
-                        msg_type = "human"
-                    elif "AIMessage" in msg_class_str:
-                        msg_type = "ai"
-                    else:
-                        msg_type = "unknown"
-                    content = getattr(msg, "content", str(msg))
-
-                if content and content not in seen_contents:  # Only add new messages
-                    new_formatted_messages.append({
-                        "type": msg_type,
-                        "content": content,
-                    })
-                    seen_contents.add(content)
-                    logger.debug("Added new message to log", call_sid=call_sid,
-                                 msg_type=msg_type, content_preview=content[:50])
-
-            # Merge messages: existing + new
-            all_messages = existing_messages + new_formatted_messages
-
-            # Merge ticket/qualification data (new values override old)
-            merged_qualification_data = {
-                **existing_qualification_data, **qualification_data}
-
-            # Merge metadata
-            existing_metadata = {}
-            if transcript_file.exists():
-                try:
-                    with open(transcript_file, "r", encoding="utf-8") as f:
-                        existing_data = json.load(f)
-                        existing_metadata = existing_data.get("metadata", {})
-                except Exception:
-                    pass
-
-            merged_metadata = {**existing_metadata, **(metadata or {})}
-            merged_metadata["last_updated"] = timestamp
-
-            transcript_data = {
-                "call_sid": call_sid,
-                "timestamp": timestamp,
-                "messages": all_messages,
-                "qualification_data": merged_qualification_data,
-                "metadata": merged_metadata,
-            }
-
-            # Write merged conversation
-            with open(transcript_file, "w", encoding="utf-8") as f:
-                json.dump(transcript_data, f, indent=2, ensure_ascii=False)
-
-            # Regenerate summary with all messages
-            summary_file = conv_dir / "summary.md"
-            summary = self._generate_summary(
-                all_messages, merged_qualification_data)
-            with open(summary_file, "w", encoding="utf-8") as f:
-                f.write(summary)
-
-            # Generate LLM summary in background thread (non-blocking)
+            jsonl_file = conv_dir / "transcript.jsonl"
+
+            async with self._get_lock(call_sid):
+                state = await self._get_state(call_sid, conv_dir)
+
+                # Process new messages and add only if not seen
+                new_formatted_messages = []
+                for msg in messages:
+                    msg_type, content = _msg_type_and_content(msg)
+                    formatted = {"type": msg_type, "content": content}
+                    if state.add_message(formatted):
+                        new_formatted_messages.append(formatted)
+                        logger.debug("Added new message to log", call_sid=call_sid,
+                                     msg_type=msg_type, content_preview=content[:50])
+
+                # Ticket data and metadata are merged on replay (new values override old)
+                update = {
+                    "timestamp": timestamp,
+                    "qualification_data": qualification_data,
+                    "metadata": {**(metadata or {}), "last_updated": timestamp},
+                }
+                state.apply({"_state": update})
+
+                records = [*new_formatted_messages, {"_state": update}]
+                payload = b"".join(orjson.dumps(record) + b"\n" for record in records)
+                await asyncio.to_thread(self._append, jsonl_file, payload)
+
+                all_messages = list(state.messages)
+
+                # Regenerate summary; only messages new since the last render are formatted
+                summary_file = conv_dir / "summary.md"
+                summary = self._generate_summary(
+                    all_messages, state.qualification_data, state)
+                await asyncio.to_thread(summary_file.write_text, summary, encoding="utf-8")
+
+            # Generate LLM summary in the background (non-blocking)
             if len(all_messages) >= 4:
-                try:
-                    import threading
-                    thread = threading.Thread(
-                        target=self._generate_llm_summary_sync,
-                        args=(all_messages, summary_file, call_sid),
-                        daemon=True
-                    )
-                    thread.start()
-                except Exception as e:
-                    logger.debug("Could not schedule LLM summary thread",
-                                 call_sid=call_sid, error=str(e))
+                task = asyncio.create_task(
+                    self._generate_llm_summary(all_messages, summary_file, call_sid)
+                )
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
 
             logger.info("Conversation logged", call_sid=call_sid,
                         total_messages=len(all_messages),
                         new_messages=len(new_formatted_messages),
-                        transcript_file=str(transcript_file),
+                        transcript_file=str(jsonl_file),
                         summary_file=str(summary_file))
 
             return {
-                "transcript": str(transcript_file),
+                "transcript": str(jsonl_file),
                 "summary": str(summary_file),
             }
         except Exception as e:
@@ -170,30 +252,79 @@ class ConversationLogger:
                          call_sid=call_sid, error=str(e), exc_info=True)
             return {}
 
-    def _generate_summary(self, messages: list[Any], qualification_data: dict) -> str:
-        """Generate markdown summary of conversation with LLM-powered insights."""
-        lines = ["# Conversation Summary\n"]
-        lines.append(
-            f"**Date:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+    async def finalize_conversation(self, call_sid: str) -> str | None:
+        """
+        Compact transcript.jsonl into transcript.json at the end of a call.
+
+        Args:
+            call_sid: Call SID
 
-        # Build conversation transcript
-        transcript_lines = []
-        for msg in messages:
-            if isinstance(msg, dict):
-                msg_type = msg.get("type", "unknown").upper()
-                content = msg.get("content", "")
-            else:
-                msg_type = "AI" if hasattr(
-                    msg, "__class__") and "AIMessage" in str(type(msg)) else "HUMAN"
-                content = getattr(msg, "content", str(msg))
+        Returns:
+            Path to transcript.json, or None if there was nothing to compact
+        """
+        try:
+            conv_dir = self.base_dir / call_sid
+            jsonl_file = conv_dir / "transcript.jsonl"
+            transcript_file = conv_dir / "transcript.json"
 
+            async with self._get_lock(call_sid):
+                self._states.pop(call_sid, None)
+                if not jsonl_file.exists():
+                    return None
+
+                # Disk is the source of truth; the cached state may have been evicted
+                state = await self._load_state(conv_dir)
+                transcript_data = {
+                    "call_sid": call_sid,
+                    "timestamp": state.timestamp,
+                    "messages": state.messages,
+                    "qualification_data": state.qualification_data,
+                    "metadata": state.metadata,
+                }
+                await asyncio.to_thread(_write_compacted, transcript_file, jsonl_file, transcript_data)
+
+            logger.info("Conversation finalized", call_sid=call_sid,
+                        total_messages=len(state.messages),
+                        transcript_file=str(transcript_file))
+            return str(transcript_file)
+        except Exception as e:
+            logger.error("Failed to finalize conversation",
+                         call_sid=call_sid, error=str(e), exc_info=True)
+            return None
+
+    def _generate_summary(
+        self,
+        messages: list[Any],
+        qualification_data: dict,
+        state: _CallState | None = None,
+    ) -> str:
+        """Generate markdown summary of conversation with LLM-powered insights.
+
+        When ``state`` is given, its cached transcript is reused and only
+        messages added since the previous render are formatted.
+        """
+        if state is None:
+            state = _CallState()
+
+        # Single pass over new messages: extend the cached transcript and count
+        transcript = state.summary_transcript
+        for msg in messages[state.summary_count:]:
+            msg_type, content = _msg_type_and_content(msg)
+            if msg_type == "human":
+                state.summary_human_count += 1
             if content:
-                transcript_lines.append(f"**{msg_type}:** {content}\n")
+                transcript.write(f"**{msg_type.upper()}:** {content}\n")
+        state.summary_count = len(messages)
+
+        buf = io.StringIO()
+        buf.write("# Conversation Summary\n")
+        buf.write(
+            f"**Date:** {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
 
-        lines.append("## Conversation Transcript\n")
-        lines.extend(transcript_lines)
+        buf.write("## Conversation Transcript\n")
+        buf.write(transcript.getvalue())
 
-        lines.append("\n## Ticket Data\n")
+        buf.write("\n## Ticket Data\n")
         for key, value in qualification_data.items():
             if value:
                 if isinstance(value, list):
@@ -201,62 +332,82 @@ class ConversationLogger:
                                           for v in value) if value else "None"
                 else:
                     value_str = str(value)
-                lines.append(
+                buf.write(
                     f"- **{key.replace('_', ' ').title()}:** {value_str}\n")
 
         # Add conversation metrics
-        lines.append("\n## Conversation Metrics\n")
-        lines.append(f"- **Total Messages:** {len(messages)}\n")
-        human_messages = sum(1 for msg in messages
-                             if (isinstance(msg, dict) and msg.get('type') == 'human') or
-                             (hasattr(msg, '__class__') and 'HumanMessage' in str(type(msg))))
+        human_messages = state.summary_human_count
         ai_messages = len(messages) - human_messages
-        lines.append(f"- **User Messages:** {human_messages}\n")
-        lines.append(f"- **AI Messages:** {ai_messages}\n")
+        buf.write("\n## Conversation Metrics\n")
+        buf.write(f"- **Total Messages:** {len(messages)}\n")
+        buf.write(f"- **User Messages:** {human_messages}\n")
+        buf.write(f"- **AI Messages:** {ai_messages}\n")
 
         if qualification_data.get("issue_type"):
-            lines.append(
+            buf.write(
                 f"- **Issue Type:** {qualification_data.get('issue_type')}\n")
         if qualification_data.get("severity"):
-            lines.append(
+            buf.write(
                 f"- **Severity:** {qualification_data.get('severity')}\n")
 
-        return "".join(lines)
+        return buf.getvalue()
 
-    def _generate_llm_summary_sync(
+    async def _generate_llm_summary(
         self, messages: list[Any], summary_file: Path, call_sid: str
     ) -> None:
-        """Generate LLM-powered summary in a thread and append to existing summary file."""
+        """Generate LLM-powered summary and append to existing summary file."""
         try:
-            import asyncio
-            conversation_text = "\n".join([
-                f"{'AI' if (isinstance(msg, dict) and msg.get('type') == 'ai') or (hasattr(msg, '__class__') and 'AIMessage' in str(type(msg))) else 'User'}: {msg.get('content', '') if isinstance(msg, dict) else getattr(msg, 'content', str(msg))}"
-                for msg in messages
-            ])
-
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                llm_summary = loop.run_until_complete(
-                    llm_service.summarize_conversation(conversation_text)
-                )
-
-                if llm_summary and summary_file.exists():
-                    with open(summary_file, "r", encoding="utf-8") as f:
-                        existing_content = f.read()
-
-                    if "## AI-Generated Summary" not in existing_content:
-                        with open(summary_file, "a", encoding="utf-8") as f:
-                            f.write("\n## AI-Generated Summary\n")
-                            f.write(f"{llm_summary}\n")
-                        logger.info(
-                            "LLM summary appended to conversation", call_sid=call_sid)
-            finally:
-                loop.close()
+            conversation_text = "\n".join(
+                f"{'AI' if msg_type == 'ai' else 'User'}: {content}"
+                for msg_type, content in map(_msg_type_and_content, messages)
+            )
+
+            async with self._summary_sem:
+                llm_summary = await llm_service.summarize_conversation(conversation_text)
+
+            if llm_summary:
+                appended = await asyncio.to_thread(_append_llm_summary, summary_file, llm_summary)
+                if appended:
+                    logger.info(
+                        "LLM summary appended to conversation", call_sid=call_sid)
         except Exception as e:
             logger.warning("Failed to generate LLM summary",
                            call_sid=call_sid, error=str(e))
 
 
+def _append_llm_summary(summary_file: Path, llm_summary: str) -> bool:
+    """Append the AI summary section unless the file already has one."""
+    if not summary_file.exists():
+        return False
+    if "## AI-Generated Summary" in summary_file.read_text(encoding="utf-8"):
+        return False
+    with open(summary_file, "a", encoding="utf-8") as f:
+        f.write("\n## AI-Generated Summary\n")
+        f.write(f"{llm_summary}\n")
+    return True
+
+
+def _parse_jsonl(raw: bytes) -> list[dict]:
+    """Parse JSONL, skipping a torn trailing line from an interrupted append."""
+    records = []
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            logger.warning("Skipping malformed transcript line")
+    return records
+
+
+def _write_compacted(transcript_file: Path, jsonl_file: Path, transcript_data: dict) -> None:
+    """Write transcript.json atomically, then drop the JSONL it replaces."""
+    tmp_file = transcript_file.with_suffix(".json.tmp")
+    tmp_file.write_bytes(
+        orjson.dumps(transcript_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
+    tmp_file.replace(transcript_file)
+    jsonl_file.unlink(missing_ok=True)
+
+
 conversation_logger = ConversationLogger()
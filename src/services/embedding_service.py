@@ -1,7 +1,12 @@
 """Embedding service for generating vector embeddings."""
 
+import asyncio
+import hashlib
 from typing import List
 
+import httpx
+import numpy as np
+import redis.asyncio as redis
 from openai import AsyncOpenAI
 
 from src.core.config import settings
@@ -10,37 +15,151 @@ from src.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+def quantize_embedding(embedding: List[float]) -> bytes:
+    """Pack an embedding as a float32 scale followed by int8 components (~4x smaller)."""
+    arr = np.asarray(embedding, dtype=np.float32)
+    max_abs = float(np.abs(arr).max()) if arr.size else 0.0
+    scale = np.float32(max_abs / 127 if max_abs else 1.0)
+    quantized = np.round(arr / scale).astype(np.int8)
+    return scale.tobytes() + quantized.tobytes()
+
+
+def dequantize_embedding(data: bytes) -> List[float]:
+    """Inverse of quantize_embedding."""
+    scale = np.frombuffer(data[:4], dtype=np.float32)[0]
+    quantized = np.frombuffer(data[4:], dtype=np.int8)
+    return (quantized.astype(np.float32) * scale).tolist()
+
+
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # HTTP/2 lets concurrent embedding requests share a few keep-alive connections
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+            ),
+        )
         self.model = settings.EMBEDDING_MODEL
+        # Single-text requests arriving within the window share one API call
+        self.batch_window = 0.010  # seconds
+        self.max_batch_size = 96
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        # Embeddings are deterministic per (model, text), so repeats are served from Redis.
+        # Stored int8-quantized: 1 byte per dimension instead of a JSON float list.
+        self.redis_client: redis.Redis | None = None
+        self.cache_ttl = 7 * 24 * 3600  # seconds
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.close()
 
     async def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
 
+        Concurrent calls are coalesced into one batched embeddings request.
+
         Args:
             text: Text to embed
 
         Returns:
             List of floats representing the embedding vector
         """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            batch, self._pending = self._pending, []
+            task = loop.create_task(self._embed_pending(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+        elif self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_window())
+
+        return await future
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            await self._embed_pending(batch)
+
+    async def _connect_cache(self) -> None:
+        # Assigned without awaiting so concurrent callers on the shared instance get one client
+        if not self.redis_client:
+            self.redis_client = redis.from_url(settings.redis_url)
+
+    def _cache_key(self, text: str) -> str:
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"emb:{self.model}:{digest}"
+
+    async def _cache_get_many(self, texts: List[str]) -> List[List[float] | None]:
         try:
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=text,
-            )
-            return response.data[0].embedding
+            await self._connect_cache()
+            values = await self.redis_client.mget([self._cache_key(t) for t in texts])
+            return [dequantize_embedding(v) if v else None for v in values]
         except Exception as e:
-            logger.error("Failed to generate embedding", error=str(e), text_preview=text[:50])
-            raise
+            logger.warning("Embedding cache read failed", error=str(e))
+            return [None] * len(texts)
+
+    async def _cache_set_many(self, items: list[tuple[str, List[float]]]) -> None:
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for text, embedding in items:
+                    pipe.set(self._cache_key(text), quantize_embedding(embedding), ex=self.cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache write failed", error=str(e))
+
+    async def _embed_cached(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, only sending cache misses to the API; preserves input order."""
+        embeddings = await self._cache_get_many(texts)
+        misses = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not misses:
+            return embeddings
+
+        response = await self.client.embeddings.create(
+            model=self.model,
+            input=[texts[i] for i in misses],
+        )
+        fresh = []
+        for item in response.data:
+            i = misses[item.index]
+            embeddings[i] = item.embedding
+            fresh.append((texts[i], item.embedding))
+        await self._cache_set_many(fresh)
+        return embeddings
+
+    async def _embed_pending(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await self._embed_cached([text for text, _ in batch])
+        except Exception as e:
+            logger.error("Failed to generate embedding", error=str(e),
+                         count=len(batch), text_preview=batch[0][0][:50])
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts in batch.
 
+        Texts already embedded with the current model are served from the cache.
+
         Args:
             texts: List of texts to embed
 
@@ -48,12 +167,11 @@ class EmbeddingService:
             List of embedding vectors
         """
         try:
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=texts,
-            )
-            return [item.embedding for item in response.data]
+            return await self._embed_cached(texts)
         except Exception as e:
             logger.error("Failed to generate batch embeddings", error=str(e), count=len(texts))
             raise
 
+
+# Singleton instance
+embedding_service = EmbeddingService()
@@ -4,6 +4,7 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+import httpx
 from jira import JIRA
 from jira.exceptions import JIRAError
 
@@ -14,6 +15,10 @@ logger = get_logger(__name__)
 
 _executor = ThreadPoolExecutor(max_workers=5)
 
+# Jira caps search results per page at 100
+JIRA_SEARCH_BATCH_SIZE = 100
+TICKET_FIELDS = "summary,description,status,priority,created,updated"
+
 
 class JiraService:
     """Service for Jira operations with async support."""
@@ -21,15 +26,51 @@ class JiraService:
     def __init__(self):
         self.client = None
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        # (project, issue type, current status) -> {transition name: id}
+        self._transitions_cache: dict[tuple[str, str, str], dict[str, str]] = {}
+        # Async REST client for the hot paths (create/get); the jira library
+        # is blocking and limited by the executor's worker count
+        self._http: httpx.AsyncClient | None = None
+
+    def _credentials_configured(self) -> bool:
+        return all([
+            settings.JIRA_SERVER,
+            settings.JIRA_EMAIL,
+            settings.JIRA_API_TOKEN,
+        ])
+
+    def _get_http(self) -> httpx.AsyncClient | None:
+        """Get the REST client, or None if Jira is not configured."""
+        if self._http is None and self._credentials_configured():
+            self._http = httpx.AsyncClient(
+                base_url=settings.JIRA_SERVER.rstrip("/"),
+                auth=(settings.JIRA_EMAIL, settings.JIRA_API_TOKEN),
+                headers={"Accept": "application/json"},
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+                timeout=httpx.Timeout(15.0, connect=5.0),
+            )
+        return self._http
+
+    async def close(self) -> None:
+        """Close the REST client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def _ensure_connected(self):
         """Ensure Jira connection is established."""
+        if self._initialized:
+            return True
+        # Concurrent first calls wait for a single handshake instead of racing
+        async with self._init_lock:
+            return await self._connect()
+
+    async def _connect(self):
+        """Build the Jira client; callers must hold _init_lock."""
         if not self._initialized:
-            if not all([
-                settings.JIRA_SERVER,
-                settings.JIRA_EMAIL,
-                settings.JIRA_API_TOKEN,
-            ]):
+            if not self._credentials_configured():
                 logger.warning(
                     "Jira credentials not configured",
                     has_server=bool(settings.JIRA_SERVER),
@@ -42,7 +83,7 @@ class JiraService:
                 # Remove trailing slash from server URL if present
                 server_url = settings.JIRA_SERVER.rstrip("/")
 
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 self.client = await loop.run_in_executor(
                     _executor,
                     lambda: JIRA(
@@ -85,8 +126,8 @@ class JiraService:
         Returns:
             Jira ticket key (e.g., "IT-123") or None if failed
         """
-        connected = await self._ensure_connected()
-        if not connected:
+        http = self._get_http()
+        if http is None:
             error_msg = "Jira not connected. Check credentials and connection logs."
             logger.error(error_msg)
             raise ValueError(error_msg)
@@ -108,20 +149,18 @@ class JiraService:
             if custom_fields:
                 issue_dict.update(custom_fields)
 
-            loop = asyncio.get_event_loop()
-            issue = await loop.run_in_executor(
-                _executor,
-                lambda: self.client.create_issue(fields=issue_dict),
-            )
+            # v2 accepts a plain-text description (v3 requires ADF)
+            response = await http.post("/rest/api/2/issue", json={"fields": issue_dict})
+            response.raise_for_status()
 
-            ticket_key = issue.key
+            ticket_key = response.json()["key"]
             logger.info("Jira ticket created",
                         ticket_key=ticket_key, summary=summary[:50])
             return ticket_key
 
-        except JIRAError as e:
-            logger.error("Jira API error", error=str(
-                e), error_code=e.status_code, exc_info=True)
+        except httpx.HTTPStatusError as e:
+            logger.error("Jira API error", error=e.response.text,
+                         error_code=e.response.status_code, exc_info=True)
             raise
         except Exception as e:
             logger.error("Failed to create Jira ticket", error=str(
@@ -155,38 +194,25 @@ class JiraService:
         if not connected:
             raise ValueError("Jira not connected")
 
-        try:
-            issue = self.client.issue(ticket_key)
-            update_fields = {}
-
-            if summary:
-                update_fields["summary"] = summary
-            if description:
-                update_fields["description"] = description
-            if priority:
-                update_fields["priority"] = {"name": priority}
-
-            if update_fields:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    _executor,
-                    lambda: issue.update(fields=update_fields),
-                )
+        update_fields = {}
+        if summary:
+            update_fields["summary"] = summary
+        if description:
+            update_fields["description"] = description
+        if priority:
+            update_fields["priority"] = {"name": priority}
 
-            if status:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    _executor,
-                    lambda: self.client.transition_issue(issue, status),
-                )
-
-            if resolution:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    _executor,
-                    lambda: issue.update(
-                        fields={"resolution": {"name": resolution}}),
-                )
+        try:
+            # Fetch, update, transition and resolve in one executor hop
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                _executor,
+                self._do_update,
+                ticket_key,
+                update_fields,
+                status,
+                resolution,
+            )
 
             logger.info("Jira ticket updated", ticket_key=ticket_key)
             return True
@@ -200,6 +226,38 @@ class JiraService:
                          ticket_key=ticket_key, error=str(e))
             raise
 
+    def _do_update(
+        self,
+        ticket_key: str,
+        update_fields: dict,
+        status: Optional[str],
+        resolution: Optional[str],
+    ) -> None:
+        """Blocking body of update_ticket; runs on the Jira executor."""
+        issue = self.client.issue(ticket_key)
+        if update_fields:
+            issue.update(fields=update_fields)
+        if status:
+            self.client.transition_issue(issue, self._transition_id(issue, status))
+        if resolution:
+            issue.update(fields={"resolution": {"name": resolution}})
+
+    def _transition_id(self, issue, status: str) -> str:
+        """Resolve a transition name to its id, memoized per workflow state."""
+        cache_key = (
+            issue.fields.project.key,
+            issue.fields.issuetype.name,
+            issue.fields.status.name,
+        )
+        transitions = self._transitions_cache.get(cache_key)
+        if transitions is None:
+            transitions = {
+                t["name"].lower(): t["id"] for t in self.client.transitions(issue)
+            }
+            self._transitions_cache[cache_key] = transitions
+        # Fall back to the name; jira resolves it (with its own lookup) or errors
+        return transitions.get(status.lower(), status)
+
     async def get_ticket(self, ticket_key: str) -> Optional[dict]:
         """
         Get ticket details from Jira.
@@ -210,25 +268,26 @@ class JiraService:
         Returns:
             Ticket details dictionary or None
         """
-        connected = await self._ensure_connected()
-        if not connected:
+        http = self._get_http()
+        if http is None:
             return None
 
         try:
-            loop = asyncio.get_event_loop()
-            issue = await loop.run_in_executor(
-                _executor,
-                lambda: self.client.issue(ticket_key),
+            response = await http.get(
+                f"/rest/api/2/issue/{ticket_key}", params={"fields": TICKET_FIELDS}
             )
+            response.raise_for_status()
+            data = response.json()
+            fields = data["fields"]
 
             return {
-                "key": issue.key,
-                "summary": issue.fields.summary,
-                "description": issue.fields.description,
-                "status": issue.fields.status.name,
-                "priority": issue.fields.priority.name if issue.fields.priority else None,
-                "created": str(issue.fields.created),
-                "updated": str(issue.fields.updated),
+                "key": data["key"],
+                "summary": fields.get("summary"),
+                "description": fields.get("description"),
+                "status": fields["status"]["name"],
+                "priority": (fields.get("priority") or {}).get("name"),
+                "created": fields.get("created"),
+                "updated": fields.get("updated"),
             }
 
         except Exception as e:
@@ -236,5 +295,65 @@ class JiraService:
                          ticket_key=ticket_key, error=str(e))
             return None
 
+    async def get_tickets(self, ticket_keys: list[str]) -> dict[str, dict]:
+        """
+        Get details for several tickets using batched JQL searches.
+
+        Args:
+            ticket_keys: Jira ticket keys
+
+        Returns:
+            Mapping of ticket key to details; keys that could not be fetched are omitted
+        """
+        connected = await self._ensure_connected()
+        if not connected or not ticket_keys:
+            return {}
+
+        keys = list(dict.fromkeys(ticket_keys))
+        tickets: dict[str, dict] = {}
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(keys), JIRA_SEARCH_BATCH_SIZE):
+            chunk = keys[start:start + JIRA_SEARCH_BATCH_SIZE]
+            jql = "issue in ({})".format(",".join(_jql_quote(key) for key in chunk))
+            try:
+                issues = await loop.run_in_executor(
+                    _executor,
+                    lambda: self.client.search_issues(
+                        jql,
+                        maxResults=len(chunk),
+                        fields=TICKET_FIELDS,
+                    ),
+                )
+                for issue in issues:
+                    tickets[issue.key] = _issue_to_dict(issue)
+            except Exception as e:
+                # Jira rejects the whole query if any key is unknown; fetch the
+                # chunk key by key so only the bad keys are omitted
+                logger.warning("Batched Jira search failed, fetching tickets individually",
+                               count=len(chunk), error=str(e))
+                results = await asyncio.gather(*(self.get_ticket(key) for key in chunk))
+                for key, ticket in zip(chunk, results):
+                    if ticket is not None:
+                        tickets[key] = ticket
+        return tickets
+
+
+def _jql_quote(value: str) -> str:
+    """Quote a value for use as a JQL string literal."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _issue_to_dict(issue) -> dict:
+    """Convert a jira Issue to the ticket details dictionary."""
+    return {
+        "key": issue.key,
+        "summary": issue.fields.summary,
+        "description": issue.fields.description,
+        "status": issue.fields.status.name,
+        "priority": issue.fields.priority.name if issue.fields.priority else None,
+        "created": str(issue.fields.created),
+        "updated": str(issue.fields.updated),
+    }
+
 
 jira_service = JiraService()
@@ -1,41 +1,210 @@
 """Knowledge base document ingestion service."""
 
+import asyncio
 import hashlib
+import multiprocessing
+import os
 import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from pypdf import PdfReader
 from docx import Document
 
 from src.core.config import settings
 from src.core.logging import get_logger
-from src.services.embedding_service import EmbeddingService
-from src.services.vector_store import vector_store
+from src.services.embedding_service import embedding_service
+from src.services.vector_store import get_vector_store
 
 logger = get_logger(__name__)
 
+# Pages per worker task; amortizes re-opening the PDF in each process
+PDF_PAGES_PER_TASK = 8
+
+_pdf_executor: ProcessPoolExecutor | None = None
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Create the PDF extraction pool on first use."""
+    global _pdf_executor
+    if _pdf_executor is None:
+        # Forking the multi-threaded app process can copy held locks into the
+        # child and duplicates its memory; forkserver children start clean
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _pdf_executor = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context)
+    return _pdf_executor
+
+
+def shutdown_pdf_executor() -> None:
+    """Stop the PDF extraction pool's worker processes, if it was started."""
+    global _pdf_executor
+    if _pdf_executor is not None:
+        _pdf_executor.shutdown(wait=True, cancel_futures=True)
+        _pdf_executor = None
+
+
+def _extract_pdf_pages(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) of a PDF (runs in a worker process)."""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
+
+
+def _document_hash(text: str) -> str:
+    """Content hash for dedup; prefixed so it is distinguishable from older md5 values."""
+    return "b2:" + hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _rstrip_end(text: str, start: int, end: int) -> int:
+    """Move end left past trailing whitespace (rstrip without a temporary string)."""
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+async def _single_piece(text: str) -> AsyncIterator[str]:
+    """Present an in-memory string as a one-piece text stream."""
+    yield text
+
+
+class _RollingChunker:
+    """
+    Incremental equivalent of KBIngestionService.chunk_text.
+
+    Text is fed in pieces; complete chunks are emitted as soon as they are
+    known, so only the unfinished tail (at most one chunk plus one piece)
+    is buffered.
+    """
+
+    def __init__(self, chunk_size: int, overlap: int):
+        self.chunk_size = chunk_size
+        self.step = chunk_size - overlap
+        self._buf = ""
+        self._emitted = False
+
+    def feed(self, text: str) -> List[str]:
+        """Add text and return the chunks it completes."""
+        buf = self._buf + text
+        chunks = []
+        pos = 0
+        # A chunk ending strictly inside the buffer is not the final chunk, so it is rstripped
+        while pos + self.chunk_size < len(buf):
+            if self.step <= 0:
+                raise ValueError("Chunk overlap must be smaller than chunk size")
+            chunks.append(buf[pos:_rstrip_end(buf, pos, pos + self.chunk_size)])
+            pos += self.step
+        self._buf = buf[pos:]
+        self._emitted = self._emitted or bool(chunks)
+        return chunks
+
+    def finish(self) -> List[str]:
+        """Return the remaining chunks once all text has been fed."""
+        buf, n = self._buf, len(self._buf)
+        self._buf = ""
+        if not self._emitted and n <= self.chunk_size:
+            return [buf]
+        if self.step <= 0:
+            raise ValueError("Chunk overlap must be smaller than chunk size")
+        return [
+            buf[start:_rstrip_end(buf, start, start + self.chunk_size)]
+            if start + self.chunk_size < n else buf[start:]
+            for start in range(0, n, self.step)
+        ]
+
 
 class KBIngestionService:
     """Service for ingesting documents into the knowledge base."""
 
     def __init__(self):
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = embedding_service
         self.chunk_size = settings.KB_CHUNK_SIZE
         self.chunk_overlap = settings.KB_CHUNK_OVERLAP
+        self.embed_batch_size = settings.KB_EMBED_BATCH_SIZE
+        self.max_concurrent_embeds = settings.KB_MAX_CONCURRENT_EMBEDS
+        # Chunks from many documents are written together; call flush() to drain
+        self.upsert_batch_size = settings.KB_UPSERT_BATCH_SIZE
+        self._upsert_buffer: Dict[str, list[tuple]] = defaultdict(list)
+        self._upsert_lock = asyncio.Lock()
 
     def _read_text_file(self, file_path: Path) -> str:
         """Read text from a .txt file."""
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
 
-    def _read_pdf(self, file_path: Path) -> str:
-        """Extract text from a PDF file."""
-        reader = PdfReader(file_path)
-        text_parts = []
-        for page in reader.pages:
-            text_parts.append(page.extract_text())
-        return "\n".join(text_parts)
+    async def _iter_pdf_pages(self, file_path: Path) -> AsyncIterator[str]:
+        """
+        Yield PDF page texts in order, extracting pages across worker processes.
+
+        Only a window of page batches is in flight at once, so pages are not
+        all held in memory before the first one is consumed.
+        """
+        page_count = await asyncio.to_thread(lambda: len(PdfReader(file_path).pages))
+        loop = asyncio.get_running_loop()
+        executor = _get_pdf_executor()
+        starts = iter(range(0, page_count, PDF_PAGES_PER_TASK))
+        in_flight: deque[asyncio.Future] = deque()
+
+        def submit() -> None:
+            start = next(starts, None)
+            if start is not None:
+                in_flight.append(loop.run_in_executor(
+                    executor,
+                    _extract_pdf_pages,
+                    str(file_path),
+                    start,
+                    min(start + PDF_PAGES_PER_TASK, page_count),
+                ))
+
+        for _ in range(os.cpu_count() or 1):
+            submit()
+        while in_flight:
+            pages = await in_flight.popleft()
+            submit()
+            for text in pages:
+                yield text
+
+    async def _read_pdf(self, file_path: Path) -> str:
+        """Extract text from a PDF file, spreading pages across worker processes."""
+        return "\n".join([text async for text in self._iter_pdf_pages(file_path)])
+
+    async def _iter_text_file(self, file_path: Path) -> AsyncIterator[str]:
+        """Yield a text file in pieces of a few chunks each."""
+        f = await asyncio.to_thread(open, file_path, "r", encoding="utf-8")
+        try:
+            while piece := await asyncio.to_thread(f.read, self.chunk_size * 4):
+                yield piece
+        finally:
+            f.close()
+
+    async def iter_document_text(self, file_path: Path) -> AsyncIterator[str]:
+        """
+        Yield a document's text in pieces, without materializing it where the format allows.
+
+        The concatenated pieces equal read_document(file_path).
+
+        Args:
+            file_path: Path to the document file
+
+        Yields:
+            Consecutive pieces of the extracted text
+        """
+        suffix = file_path.suffix.lower()
+
+        if suffix in [".txt", ".md", ".markdown"]:
+            async for piece in self._iter_text_file(file_path):
+                yield piece
+        elif suffix == ".pdf":
+            first = True
+            async for text in self._iter_pdf_pages(file_path):
+                yield text if first else "\n" + text
+                first = False
+        elif suffix == ".docx":
+            # python-docx parses the whole file up front; nothing to stream
+            yield await asyncio.to_thread(self._read_docx, file_path)
+        else:
+            raise ValueError(f"Unsupported file type: {suffix}")
 
     def _read_docx(self, file_path: Path) -> str:
         """Extract text from a DOCX file."""
@@ -48,7 +217,7 @@ class KBIngestionService:
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
 
-    def read_document(self, file_path: Path) -> str:
+    async def read_document(self, file_path: Path) -> str:
         """
         Read text from a document file.
 
@@ -61,13 +230,13 @@ class KBIngestionService:
         suffix = file_path.suffix.lower()
 
         if suffix == ".txt":
-            return self._read_text_file(file_path)
+            return await asyncio.to_thread(self._read_text_file, file_path)
         elif suffix == ".pdf":
-            return self._read_pdf(file_path)
+            return await self._read_pdf(file_path)
         elif suffix == ".docx":
-            return self._read_docx(file_path)
+            return await asyncio.to_thread(self._read_docx, file_path)
         elif suffix in [".md", ".markdown"]:
-            return self._read_markdown(file_path)
+            return await asyncio.to_thread(self._read_markdown, file_path)
         else:
             raise ValueError(f"Unsupported file type: {suffix}")
 
@@ -89,20 +258,152 @@ class KBIngestionService:
         if len(text) <= chunk_size:
             return [text]
 
-        chunks = []
+        step = chunk_size - overlap
+        if step <= 0:
+            raise ValueError("Chunk overlap must be smaller than chunk size")
+
+        # Offsets are plain integer arithmetic; each chunk is sliced exactly once
+        n = len(text)
+        offsets = [(start, min(start + chunk_size, n)) for start in range(0, n, step)]
+        return [
+            text[start:_rstrip_end(text, start, end) if end < n else end]
+            for start, end in offsets
+        ]
+
+    async def _stream_chunks_and_embed(
+        self,
+        pieces: AsyncIterator[str],
+    ) -> tuple[List[str], List[asyncio.Task], str]:
+        """
+        Chunk streamed text and start embedding each micro-batch as soon as it is full.
+
+        Args:
+            pieces: Consecutive pieces of a document's text
+
+        Returns:
+            (chunks, embedding tasks one per consecutive batch of chunks, document hash)
+        """
+        chunker = _RollingChunker(self.chunk_size, self.chunk_overlap)
+        hasher = hashlib.blake2b(digest_size=16)
+        semaphore = asyncio.Semaphore(self.max_concurrent_embeds)
+        chunks: List[str] = []
+        tasks: List[asyncio.Task] = []
+        dispatched = 0
+
+        async def _embed(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embedding_service.embed_batch(batch)
+
+        def dispatch(final: bool = False) -> None:
+            nonlocal dispatched
+            while len(chunks) - dispatched >= self.embed_batch_size or (final and dispatched < len(chunks)):
+                batch = chunks[dispatched:dispatched + self.embed_batch_size]
+                tasks.append(asyncio.create_task(_embed(batch)))
+                dispatched += len(batch)
+
+        try:
+            async for piece in pieces:
+                hasher.update(piece.encode())
+                chunks.extend(chunker.feed(piece))
+                dispatch()
+            chunks.extend(chunker.finish())
+            dispatch(final=True)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return chunks, tasks, "b2:" + hasher.hexdigest()
+
+    async def _upsert_as_embedded(
+        self,
+        tenant_id: str,
+        chunks: List[str],
+        embed_tasks: List[asyncio.Task],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+    ) -> None:
+        """
+        Hand each embedded batch to the vector store while later batches are still embedding.
+
+        Args:
+            tenant_id: Tenant identifier
+            chunks: All chunks of the document
+            embed_tasks: Embedding tasks, one per consecutive batch of chunks
+            metadatas: Metadata per chunk
+            ids: ID per chunk
+        """
         start = 0
+        try:
+            for task in embed_tasks:
+                embeddings = await task
+                stop = start + len(embeddings)
+                await self._buffer_upsert(
+                    tenant_id=tenant_id,
+                    documents=chunks[start:stop],
+                    embeddings=embeddings,
+                    metadatas=metadatas[start:stop],
+                    ids=ids[start:stop],
+                )
+                start = stop
+        except BaseException:
+            for task in embed_tasks:
+                task.cancel()
+            raise
 
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
+    async def _write_rows(self, tenant_id: str, rows: list[tuple]) -> None:
+        """Write (document, embedding, metadata, id) rows in upsert-sized batches."""
+        for start in range(0, len(rows), self.upsert_batch_size):
+            batch = rows[start:start + self.upsert_batch_size]
+            await get_vector_store().aadd_documents(
+                tenant_id=tenant_id,
+                documents=[r[0] for r in batch],
+                embeddings=[r[1] for r in batch],
+                metadatas=[r[2] for r in batch],
+                ids=[r[3] for r in batch],
+            )
 
-            if end < len(text):
-                chunk = chunk.rstrip()
+    async def _buffer_upsert(
+        self,
+        tenant_id: str,
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+    ) -> None:
+        """Queue rows for the vector store, writing once the tenant's buffer is full."""
+        rows = None
+        async with self._upsert_lock:
+            buffer = self._upsert_buffer[tenant_id]
+            buffer.extend(zip(documents, embeddings, metadatas, ids))
+            if len(buffer) >= self.upsert_batch_size:
+                rows = self._upsert_buffer.pop(tenant_id)
+        if rows:
+            await self._write_rows(tenant_id, rows)
+
+    async def flush(self, tenant_id: Optional[str] = None) -> int:
+        """
+        Write any buffered chunks to the vector store.
 
-            chunks.append(chunk)
-            start = end - overlap
+        Args:
+            tenant_id: Only flush this tenant (defaults to all tenants)
 
-        return chunks
+        Returns:
+            Number of chunks written
+        """
+        async with self._upsert_lock:
+            if tenant_id is None:
+                pending = dict(self._upsert_buffer)
+                self._upsert_buffer.clear()
+            else:
+                pending = {tenant_id: self._upsert_buffer.pop(tenant_id, [])}
+
+        written = 0
+        for tenant, rows in pending.items():
+            if rows:
+                await self._write_rows(tenant, rows)
+                written += len(rows)
+        return written
 
     async def ingest_document(
         self,
@@ -128,38 +429,30 @@ class KBIngestionService:
         try:
             logger.info("Ingesting document", tenant_id=tenant_id, file_path=str(file_path), category=category)
 
-            text = self.read_document(file_path)
-            chunks = self.chunk_text(text)
-
+            # Chunks are cut and embedded while the document is still being read
+            chunks, embed_tasks, document_hash = await self._stream_chunks_and_embed(
+                self.iter_document_text(file_path)
+            )
             document_id = str(uuid.uuid4())
-            document_hash = hashlib.md5(text.encode()).hexdigest()
-
-            embeddings = await self.embedding_service.embed_batch(chunks)
 
-            metadatas = []
-            ids = []
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{document_id}_chunk_{i}"
-                chunk_metadata = {
-                    "document_id": document_id,
-                    "document_path": str(file_path),
-                    "document_name": file_path.name,
-                    "category": category,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "document_hash": document_hash,
-                    "tags": ", ".join(tags) if tags else "",  # ChromaDB doesn't support lists in metadata
-                    **(metadata or {}),
-                }
-
-                metadatas.append(chunk_metadata)
-                ids.append(chunk_id)
+            # Document-level fields are built once; each chunk only adds its index
+            base_meta = {
+                "document_id": document_id,
+                "document_path": str(file_path),
+                "document_name": file_path.name,
+                "category": category,
+                "total_chunks": len(chunks),
+                "document_hash": document_hash,
+                "tags": ", ".join(tags) if tags else "",  # ChromaDB doesn't support lists in metadata
+                **(metadata or {}),
+            }
+            metadatas = [{**base_meta, "chunk_index": i} for i in range(len(chunks))]
+            ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
 
-            vector_store.add_documents(
+            await self._upsert_as_embedded(
                 tenant_id=tenant_id,
-                documents=chunks,
-                embeddings=embeddings,
+                chunks=chunks,
+                embed_tasks=embed_tasks,
                 metadatas=metadatas,
                 ids=ids,
             )
@@ -205,33 +498,24 @@ class KBIngestionService:
         try:
             logger.info("Ingesting text", tenant_id=tenant_id, document_name=document_name, category=category)
 
-            chunks = self.chunk_text(text)
+            chunks, embed_tasks, _ = await self._stream_chunks_and_embed(_single_piece(text))
             document_id = str(uuid.uuid4())
 
-            embeddings = await self.embedding_service.embed_batch(chunks)
-
-            metadatas = []
-            ids = []
-
-            for i, chunk in enumerate(chunks):
-                chunk_id = f"{document_id}_chunk_{i}"
-                chunk_metadata = {
-                    "document_id": document_id,
-                    "document_name": document_name,
-                    "category": category,
-                    "chunk_index": i,
-                    "total_chunks": len(chunks),
-                    "tags": ", ".join(tags) if tags else "",  # ChromaDB doesn't support lists in metadata
-                    **(metadata or {}),
-                }
-
-                metadatas.append(chunk_metadata)
-                ids.append(chunk_id)
+            base_meta = {
+                "document_id": document_id,
+                "document_name": document_name,
+                "category": category,
+                "total_chunks": len(chunks),
+                "tags": ", ".join(tags) if tags else "",  # ChromaDB doesn't support lists in metadata
+                **(metadata or {}),
+            }
+            metadatas = [{**base_meta, "chunk_index": i} for i in range(len(chunks))]
+            ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
 
-            vector_store.add_documents(
+            await self._upsert_as_embedded(
                 tenant_id=tenant_id,
-                documents=chunks,
-                embeddings=embeddings,
+                chunks=chunks,
+                embed_tasks=embed_tasks,
                 metadatas=metadatas,
                 ids=ids,
             )
@@ -251,6 +535,136 @@ class KBIngestionService:
             logger.error("Failed to ingest text", tenant_id=tenant_id, document_name=document_name, error=str(e), exc_info=True)
             raise
 
+    async def ingest_documents_pipeline(
+        self,
+        tenant_id: str,
+        file_paths: List[Path],
+        category: str = "general",
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        load_workers: int = 2,
+        upsert_batch_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest many documents with read, chunk, embed and upsert running as overlapped stages.
+
+        Stages are connected by bounded queues, so a slow stage applies
+        backpressure instead of buffering whole documents in memory. Embedding
+        and upsert batch sizes are tuned independently.
+
+        Args:
+            tenant_id: Tenant identifier
+            file_paths: Paths of the documents to ingest
+            category: Document category applied to every document
+            tags: Optional list of tags
+            metadata: Optional additional metadata
+            load_workers: Number of concurrent document readers
+            upsert_batch_size: Chunks per vector store write (defaults to config)
+
+        Returns:
+            One result dictionary per document (with an "error" key if it failed to load)
+        """
+        upsert_batch_size = upsert_batch_size or self.upsert_batch_size
+        path_q: asyncio.Queue = asyncio.Queue()
+        for file_path in file_paths:
+            path_q.put_nowait(file_path)
+        text_q: asyncio.Queue = asyncio.Queue(maxsize=4)
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=4)
+        upsert_q: asyncio.Queue = asyncio.Queue(maxsize=4)
+        results: Dict[str, Dict[str, Any]] = {}
+        tags_value = ", ".join(tags) if tags else ""  # ChromaDB doesn't support lists in metadata
+
+        async def load() -> None:
+            while not path_q.empty():
+                file_path = path_q.get_nowait()
+                try:
+                    text = await self.read_document(file_path)
+                except Exception as e:
+                    logger.error("Failed to read document", tenant_id=tenant_id,
+                                 file_path=str(file_path), error=str(e))
+                    results[str(file_path)] = {"document_name": file_path.name, "error": str(e)}
+                    continue
+                await text_q.put((file_path, text))
+
+        async def run_loaders() -> None:
+            await asyncio.gather(*(load() for _ in range(load_workers)))
+            await text_q.put(None)
+
+        async def chunk() -> None:
+            batch: list[tuple[str, dict, str]] = []
+            while (item := await text_q.get()) is not None:
+                file_path, text = item
+                chunks = self.chunk_text(text)
+                document_id = str(uuid.uuid4())
+                document_hash = _document_hash(text)
+                results[str(file_path)] = {
+                    "document_id": document_id,
+                    "document_name": file_path.name,
+                    "chunks_count": len(chunks),
+                    "category": category,
+                    "tags": tags or [],
+                }
+                base_meta = {
+                    "document_id": document_id,
+                    "document_path": str(file_path),
+                    "document_name": file_path.name,
+                    "category": category,
+                    "total_chunks": len(chunks),
+                    "document_hash": document_hash,
+                    "tags": tags_value,
+                    **(metadata or {}),
+                }
+                for i, chunk_text in enumerate(chunks):
+                    batch.append((chunk_text, {**base_meta, "chunk_index": i}, f"{document_id}_chunk_{i}"))
+                    if len(batch) >= self.embed_batch_size:
+                        await embed_q.put(batch)
+                        batch = []
+            if batch:
+                await embed_q.put(batch)
+            for _ in range(self.max_concurrent_embeds):
+                await embed_q.put(None)
+
+        async def embed() -> None:
+            while (batch := await embed_q.get()) is not None:
+                embeddings = await self.embedding_service.embed_batch([c for c, _, _ in batch])
+                await upsert_q.put([
+                    (chunk_text, embedding, chunk_metadata, chunk_id)
+                    for (chunk_text, chunk_metadata, chunk_id), embedding in zip(batch, embeddings)
+                ])
+
+        async def run_embedders() -> None:
+            await asyncio.gather(*(embed() for _ in range(self.max_concurrent_embeds)))
+            await upsert_q.put(None)
+
+        async def upsert() -> None:
+            pending: list = []
+            while (rows := await upsert_q.get()) is not None:
+                pending.extend(rows)
+                while len(pending) >= upsert_batch_size:
+                    await self._write_rows(tenant_id, pending[:upsert_batch_size])
+                    pending = pending[upsert_batch_size:]
+            if pending:
+                await self._write_rows(tenant_id, pending)
+
+        logger.info("Ingesting documents", tenant_id=tenant_id,
+                    document_count=len(file_paths), category=category)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(run_loaders())
+                tg.create_task(chunk())
+                tg.create_task(run_embedders())
+                tg.create_task(upsert())
+        except* Exception as eg:
+            logger.error("Document pipeline failed", tenant_id=tenant_id,
+                         error=str(eg.exceptions[0]), exc_info=True)
+            raise
+
+        ordered = [results[str(p)] for p in file_paths if str(p) in results]
+        logger.info("Documents ingested", tenant_id=tenant_id,
+                    document_count=len(ordered),
+                    chunks_count=sum(r.get("chunks_count", 0) for r in ordered))
+        return ordered
+
 
 kb_ingestion_service = KBIngestionService()
 
@@ -1,13 +1,16 @@
 """Knowledge base retrieval service with RAG support and caching."""
 
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
-from datetime import datetime, timedelta
 from hashlib import md5
 
+import numpy as np
+
 from src.core.config import settings
 from src.core.logging import get_logger
-from src.services.embedding_service import EmbeddingService
-from src.services.vector_store import vector_store
+from src.services.embedding_service import embedding_service
+from src.services.vector_store import get_vector_store
 
 logger = get_logger(__name__)
 
@@ -15,27 +18,43 @@ logger = get_logger(__name__)
 class CacheEntry:
     """Cache entry for KB retrieval results."""
 
-    def __init__(self, chunks: List[Dict[str, Any]], timestamp: datetime):
+    def __init__(
+        self,
+        chunks: List[Dict[str, Any]],
+        timestamp: float,
+        scope: str = "",
+        query_vec: Optional[np.ndarray] = None,
+    ):
         self.chunks = chunks
         self.timestamp = timestamp
+        self.scope = scope
+        self.query_vec = query_vec
 
 
 class KBRetrievalService:
     """Service for retrieving relevant knowledge base content using RAG with caching."""
 
     def __init__(self):
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = embedding_service
         self.top_k = settings.RAG_TOP_K
         self.similarity_threshold = settings.RAG_SIMILARITY_THRESHOLD
-        self._cache: Dict[str, CacheEntry] = {}
-        self._cache_ttl = timedelta(minutes=30)  # Cache for 30 minutes
-
-    def _ensure_cache_initialized(self):
-        """Ensure cache is initialized (for backward compatibility)."""
-        if not hasattr(self, '_cache'):
-            self._cache: Dict[str, CacheEntry] = {}
-        if not hasattr(self, '_cache_ttl'):
-            self._cache_ttl = timedelta(minutes=30)
+        # LRU order: least recently used first
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._cache_ttl = 30 * 60  # Cache for 30 minutes (seconds, monotonic clock)
+        self._cache_max_entries = 100
+        # Semantic tier: near-duplicate phrasings within the same tenant/filters
+        # reuse a cached result. Matrices are built lazily per scope.
+        self._semantic_threshold = 0.95
+        self._scope_index: Dict[str, tuple[List[str], np.ndarray]] = {}
+
+    @staticmethod
+    def _get_scope(
+        tenant_id: str,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> str:
+        """Cache scope: results are only shared between queries with the same filters."""
+        return "|".join([tenant_id, category or "", ",".join(sorted(tags or []))])
 
     def _get_cache_key(
         self,
@@ -45,39 +64,105 @@ class KBRetrievalService:
         tags: Optional[List[str]] = None,
     ) -> str:
         """Generate cache key for query."""
-        key_parts = [tenant_id, query.lower().strip(), category or "",
-                     ",".join(sorted(tags or []))]
-        key_string = "|".join(key_parts)
+        key_string = f"{self._get_scope(tenant_id, category, tags)}|{query.lower().strip()}"
         return md5(key_string.encode()).hexdigest()
 
+    def _get_semantic_match(
+        self, scope: str, query_vec: np.ndarray
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for the most similar cached query in scope, if close enough."""
+        index = self._scope_index.get(scope)
+        if index is None:
+            keys = [
+                key for key, entry in self._cache.items()
+                if entry.scope == scope and entry.query_vec is not None
+            ]
+            if not keys:
+                return None
+            index = (keys, np.stack([self._cache[key].query_vec for key in keys]))
+            self._scope_index[scope] = index
+
+        keys, matrix = index
+        similarities = matrix @ query_vec
+        best = int(np.argmax(similarities))
+        if similarities[best] < self._semantic_threshold:
+            return None
+        logger.debug("KB semantic cache hit", similarity=float(similarities[best]))
+        return self._get_from_cache(keys[best])
+
     def _get_from_cache(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached results if available and not expired."""
-        self._ensure_cache_initialized()
-        if cache_key in self._cache:
-            entry = self._cache[cache_key]
-            if datetime.utcnow() - entry.timestamp < self._cache_ttl:
-                logger.debug("KB cache hit", cache_key=cache_key[:8])
-                return entry.chunks
-            else:
-                # Expired, remove from cache
-                del self._cache[cache_key]
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.timestamp < self._cache_ttl:
+            self._cache.move_to_end(cache_key)
+            logger.debug("KB cache hit", cache_key=cache_key[:8])
+            return entry.chunks
+        # Expired, remove from cache
+        del self._cache[cache_key]
+        self._scope_index.clear()
         return None
 
-    def _add_to_cache(self, cache_key: str, chunks: List[Dict[str, Any]]) -> None:
+    def _add_to_cache(
+        self,
+        cache_key: str,
+        chunks: List[Dict[str, Any]],
+        scope: str = "",
+        query_vec: Optional[np.ndarray] = None,
+    ) -> None:
         """Add results to cache."""
-        self._ensure_cache_initialized()
-        # Limit cache size to prevent memory issues
-        if len(self._cache) > 100:
-            # Remove oldest entries
-            sorted_entries = sorted(
-                self._cache.items(), key=lambda x: x[1].timestamp)
-            for key, _ in sorted_entries[:20]:
-                del self._cache[key]
-
-        self._cache[cache_key] = CacheEntry(chunks, datetime.utcnow())
+        self._scope_index.clear()
+        self._cache.pop(cache_key, None)
+        # Limit cache size to prevent memory issues; evict least recently used
+        while len(self._cache) >= self._cache_max_entries:
+            self._cache.popitem(last=False)
+
+        self._cache[cache_key] = CacheEntry(chunks, time.monotonic(), scope, query_vec)
         logger.debug("KB cache updated",
                      cache_key=cache_key[:8], cache_size=len(self._cache))
 
+    async def _search(
+        self,
+        tenant_id: str,
+        query_embedding: List[float],
+        top_k: int,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query the vector store for chunks above the similarity threshold."""
+        where_filter = {}
+        if category:
+            where_filter["category"] = category
+        if tags:
+            where_filter["tags"] = {"$in": tags}
+
+        results = await get_vector_store().aquery(
+            tenant_id=tenant_id,
+            query_embeddings=query_embedding,
+            n_results=top_k,
+            where=where_filter if where_filter else None,
+            min_similarity=self.similarity_threshold,
+        )
+
+        retrieved_chunks = []
+
+        if results.get("ids") and len(results["ids"]) > 0:
+            documents = results.get("documents", [[]])[0]
+            metadatas = results.get("metadatas", [[]])[0]
+            distances = results.get("distances", [[]])[0]
+
+            # Matches below the similarity threshold are already dropped by the store
+            for i, (doc, metadata, distance) in enumerate(zip(documents, metadatas, distances)):
+                retrieved_chunks.append({
+                    "content": doc,
+                    "metadata": metadata,
+                    "similarity_score": 1.0 - distance,
+                    "rank": i + 1,
+                })
+
+        return retrieved_chunks
+
     async def retrieve_relevant_context(
         self,
         tenant_id: str,
@@ -104,55 +189,39 @@ class KBRetrievalService:
         try:
             top_k = top_k or self.top_k
 
+            cache_status = "disabled"
+            retrieved_chunks = None
+
             # Check cache first
             if use_cache:
                 cache_key = self._get_cache_key(
                     tenant_id, query, category, tags)
-                cached_result = self._get_from_cache(cache_key)
-                if cached_result is not None:
-                    return cached_result
-
-            query_embedding = await self.embedding_service.embed_text(query)
-
-            where_filter = {}
-            if category:
-                where_filter["category"] = category
-            if tags:
-                where_filter["tags"] = {"$in": tags}
-
-            results = vector_store.query(
-                tenant_id=tenant_id,
-                query_embeddings=query_embedding,
-                n_results=top_k,
-                where=where_filter if where_filter else None,
-            )
-
-            retrieved_chunks = []
-
-            if results.get("ids") and len(results["ids"]) > 0:
-                documents = results.get("documents", [[]])[0]
-                metadatas = results.get("metadatas", [[]])[0]
-                distances = results.get("distances", [[]])[0]
-
-                for i, (doc, metadata, distance) in enumerate(zip(documents, metadatas, distances)):
-                    similarity_score = 1.0 - distance
-
-                    if similarity_score >= self.similarity_threshold:
-                        retrieved_chunks.append({
-                            "content": doc,
-                            "metadata": metadata,
-                            "similarity_score": similarity_score,
-                            "rank": i + 1,
-                        })
-
-            # Cache the results
-            if use_cache and retrieved_chunks:
-                cache_key = self._get_cache_key(
-                    tenant_id, query, category, tags)
-                self._add_to_cache(cache_key, retrieved_chunks)
+                retrieved_chunks = self._get_from_cache(cache_key)
+                cache_status = "miss" if retrieved_chunks is None else "hit"
+
+            if retrieved_chunks is None:
+                query_embedding = await self.embedding_service.embed_text(query)
+
+                # The embedding is needed for the vector search anyway, so the
+                # semantic lookup costs one small matrix-vector product
+                if use_cache:
+                    scope = self._get_scope(tenant_id, category, tags)
+                    query_vec = np.asarray(query_embedding, dtype=np.float32)
+                    norm = float(np.linalg.norm(query_vec))
+                    if norm:
+                        query_vec /= norm
+                    retrieved_chunks = self._get_semantic_match(scope, query_vec)
+                    if retrieved_chunks is not None:
+                        cache_status = "semantic_hit"
+
+            if retrieved_chunks is None:
+                retrieved_chunks = await self._search(
+                    tenant_id, query_embedding, top_k, category, tags)
+
+                # Cache the results
+                if use_cache and retrieved_chunks:
+                    self._add_to_cache(cache_key, retrieved_chunks, scope, query_vec)
 
-            cache_status = "cached" if (
-                use_cache and cache_key in self._cache) else "fresh"
             logger.info(
                 "Retrieved KB context",
                 tenant_id=tenant_id,
@@ -170,7 +239,7 @@ class KBRetrievalService:
             # Return empty list on error - graceful degradation
             return []
 
-    async def format_context_for_prompt(self, retrieved_chunks: List[Dict[str, Any]]) -> str:
+    def format_context_for_prompt(self, retrieved_chunks: List[Dict[str, Any]]) -> str:
         """
         Format retrieved chunks into a prompt-friendly context string.
 
@@ -183,16 +252,12 @@ class KBRetrievalService:
         if not retrieved_chunks:
             return "No relevant knowledge base articles found."
 
-        # Optimized formatting for lower token usage
-        context_parts = []
-        for chunk in retrieved_chunks[:3]:  # Limit to top 3 chunks for speed
-            content = chunk['content']
-            # Truncate long content (keep first 300 chars per chunk)
-            if len(content) > 300:
-                content = content[:300] + "..."
-            context_parts.append(content)
-
-        return "\n\n".join(context_parts)
+        # Optimized formatting for lower token usage: top 3 chunks,
+        # each truncated to its first 300 chars
+        return "\n\n".join(
+            f"{chunk['content'][:300]}..." if len(chunk['content']) > 300 else chunk['content']
+            for chunk in retrieved_chunks[:3]
+        )
 
     async def get_kb_context(
         self,
@@ -217,7 +282,7 @@ class KBRetrievalService:
             category=category,
         )
 
-        return await self.format_context_for_prompt(chunks)
+        return self.format_context_for_prompt(chunks)
 
 
 kb_retrieval_service = KBRetrievalService()
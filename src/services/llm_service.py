@@ -1,5 +1,10 @@
 """LLM service for conversation and data extraction."""
 
+import hashlib
+import json
+from collections import OrderedDict
+
+import httpx
 from openai import AsyncOpenAI
 
 from src.core.config import settings
@@ -13,14 +18,35 @@ class LLMService:
 
     def __init__(self):
         """Initialize OpenAI client."""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        # HTTP/2 multiplexes concurrent completions over a few keep-alive connections
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            ),
+        )
         self.model = settings.OPENAI_MODEL
+        # Exact-match LRU of completions; identical requests skip the round-trip
+        self._resp_cache: OrderedDict[str, str] = OrderedDict()
+        self._resp_cache_max = 1024
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.client.close()
 
     async def generate_response(
         self,
         prompt: str,
         system_prompt: str | None = None,
         temperature: float = 0.7,
+        response_format: dict | None = None,
+        use_cache: bool = True,
     ) -> str:
         """
         Generate text response using GPT-4o-mini.
@@ -29,25 +55,51 @@ class LLMService:
             prompt: User prompt
             system_prompt: Optional system prompt
             temperature: Sampling temperature (0-2)
+            response_format: Optional OpenAI response format
+                (e.g. {"type": "json_object"})
+            use_cache: Serve identical requests from the in-process cache;
+                disable for generation that should vary between calls
 
         Returns:
             Generated text response
         """
+        cache_key = None
+        if use_cache:
+            cache_key = hashlib.blake2b(
+                f"{self.model}|{temperature}|{response_format}|{system_prompt}|{prompt}".encode(),
+                digest_size=16,
+            ).hexdigest()
+            cached = self._resp_cache.get(cache_key)
+            if cached is not None:
+                self._resp_cache.move_to_end(cache_key)
+                logger.debug("LLM cache hit", prompt_length=len(prompt))
+                return cached
+
         try:
             messages = []
             if system_prompt:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
 
+            kwargs = {}
+            if response_format:
+                kwargs["response_format"] = response_format
+
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature,
+                **kwargs,
             )
 
             text = response.choices[0].message.content
             logger.debug("LLM response generated", prompt_length=len(
                 prompt), response_length=len(text or ""))
+
+            if cache_key is not None and text:
+                self._resp_cache[cache_key] = text
+                if len(self._resp_cache) > self._resp_cache_max:
+                    self._resp_cache.popitem(last=False)
             return text or ""
 
         except Exception as e:
@@ -81,7 +133,6 @@ Return only valid JSON matching the schema."""
             response = await self.generate_response(prompt, system_prompt, temperature=0.3)
 
             # Parse JSON response
-            import json
             data = json.loads(response)
             logger.info("Structured data extracted", fields=list(data.keys()))
             return data
@@ -113,6 +164,59 @@ Return only valid JSON matching the schema."""
             logger.error("Summarization error", error=str(e))
             raise
 
+    async def finalize_conversation(
+        self,
+        conversation_text: str,
+        extraction_schema: dict,
+    ) -> dict:
+        """
+        Summarize and extract structured data in a single GPT-4o-mini call.
+
+        Replaces back-to-back summarize_conversation + extract_structured_data
+        calls at call-end with one round-trip and one system prompt.
+
+        Args:
+            conversation_text: Conversation transcript
+            extraction_schema: JSON schema for extraction
+
+        Returns:
+            Dictionary with "summary" (str) and "extracted" (dict) keys
+        """
+        try:
+            system_prompt = f"""You are a conversation post-processor. Return JSON with keys 'summary' (string) and 'extracted' (object).
+- 'summary': a concise summary of the conversation, highlighting key points and decisions.
+- 'extracted': structured data from the conversation matching this schema:
+{extraction_schema}"""
+
+            prompt = f"Process this conversation:\n\n{conversation_text}"
+
+            # json_object mode guarantees a parseable response
+            response = await self.generate_response(
+                prompt,
+                system_prompt,
+                temperature=0.3,
+                response_format={"type": "json_object"},
+            )
+            data = json.loads(response)
+            if not isinstance(data, dict):
+                data = {}
+            extracted = data.get("extracted")
+            result = {
+                "summary": str(data.get("summary") or ""),
+                # The model can return a list or string here; only an object is usable
+                "extracted": extracted if isinstance(extracted, dict) else {},
+            }
+            logger.info(
+                "Conversation finalized",
+                summary_length=len(result["summary"]),
+                fields=list(result["extracted"].keys()),
+            )
+            return result
+
+        except Exception as e:
+            logger.error("Conversation finalization error", error=str(e))
+            raise
+
 
 # Singleton instance
 llm_service = LLMService()
@@ -1,8 +1,8 @@
 """Redis-based session state management."""
 
-import json
 from typing import Any
 
+import orjson
 import redis.asyncio as redis
 
 from src.core.config import settings
@@ -16,25 +16,37 @@ class SessionManager:
 
     def __init__(self):
         """Initialize Redis connection."""
-        self.redis_client: redis.Redis | None = None
+        # Pool and client are built synchronously; connections open on first use,
+        # so session methods never need to await a connect step
+        self._pool = redis.ConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=64,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        self.redis_client = redis.Redis(connection_pool=self._pool)
         self.default_ttl = 3600  # 1 hour
 
     async def connect(self) -> None:
-        """Connect to Redis."""
-        if not self.redis_client:
-            self.redis_client = await redis.from_url(
-                settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-            )
-            logger.info("Connected to Redis", url=settings.redis_url)
+        """Open a pooled connection up front (called at app startup)."""
+        await self.redis_client.ping()
+        logger.info("Connected to Redis", url=settings.redis_url)
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
-        if self.redis_client:
-            await self.redis_client.close()
-            self.redis_client = None
-            logger.info("Disconnected from Redis")
+        # The pool reconnects lazily if the manager is used again
+        await self._pool.disconnect()
+        logger.info("Disconnected from Redis")
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    @staticmethod
+    def _encode_fields(data: dict[str, Any]) -> dict[str, bytes]:
+        """Encode each top-level value separately so fields can be updated on their own."""
+        # default=str keeps datetimes and other non-JSON values serializable
+        return {field: orjson.dumps(value, default=str) for field, value in data.items()}
 
     async def get_session(self, session_id: str) -> dict[str, Any] | None:
         """
@@ -46,11 +58,16 @@ class SessionManager:
         Returns:
             Session data dictionary or None if not found
         """
-        await self.connect()
+        key = self._key(session_id)
         try:
-            data = await self.redis_client.get(f"session:{session_id}")
-            if data:
-                return json.loads(data)
+            try:
+                fields = await self.redis_client.hgetall(key)
+            except redis.ResponseError:
+                # Legacy session stored as a single JSON string
+                data = await self.redis_client.get(key)
+                return orjson.loads(data) if data else None
+            if fields:
+                return {field: orjson.loads(value) for field, value in fields.items()}
             return None
         except Exception as e:
             logger.error("Failed to get session", session_id=session_id, error=str(e))
@@ -70,14 +87,15 @@ class SessionManager:
             data: Session data dictionary
             ttl: Time to live in seconds (defaults to default_ttl)
         """
-        await self.connect()
+        key = self._key(session_id)
         try:
             ttl = ttl or self.default_ttl
-            await self.redis_client.setex(
-                f"session:{session_id}",
-                ttl,
-                json.dumps(data),
-            )
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if data:
+                    pipe.hset(key, mapping=self._encode_fields(data))
+                    pipe.expire(key, ttl)
+                await pipe.execute()
             logger.debug("Session updated", session_id=session_id, ttl=ttl)
         except Exception as e:
             logger.error("Failed to set session", session_id=session_id, error=str(e))
@@ -92,14 +110,29 @@ class SessionManager:
         """
         Update session data (merge with existing).
 
+        Only the updated fields are written, atomically with the TTL refresh,
+        in a single round-trip.
+
         Args:
             session_id: Session identifier
             updates: Dictionary of updates to merge
             ttl: Time to live in seconds
         """
-        current = await self.get_session(session_id) or {}
-        current.update(updates)
-        await self.set_session(session_id, current, ttl)
+        if not updates:
+            return
+        key = self._key(session_id)
+        ttl = ttl or self.default_ttl
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=self._encode_fields(updates))
+                pipe.expire(key, ttl)
+                await pipe.execute()
+            logger.debug("Session updated", session_id=session_id, ttl=ttl)
+        except redis.ResponseError:
+            # Legacy JSON-string session: merge once and rewrite it as a hash
+            current = await self.get_session(session_id) or {}
+            current.update(updates)
+            await self.set_session(session_id, current, ttl)
 
     async def delete_session(self, session_id: str) -> None:
         """
@@ -108,9 +141,8 @@ class SessionManager:
         Args:
             session_id: Session identifier
         """
-        await self.connect()
         try:
-            await self.redis_client.delete(f"session:{session_id}")
+            await self.redis_client.delete(self._key(session_id))
             logger.debug("Session deleted", session_id=session_id)
         except Exception as e:
             logger.error("Failed to delete session", session_id=session_id, error=str(e))
@@ -125,9 +157,8 @@ class SessionManager:
         Returns:
             True if session exists, False otherwise
         """
-        await self.connect()
         try:
-            return await self.redis_client.exists(f"session:{session_id}") > 0
+            return await self.redis_client.exists(self._key(session_id)) > 0
         except Exception as e:
             logger.error("Failed to check session", session_id=session_id, error=str(e))
             return False
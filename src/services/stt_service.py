@@ -1,5 +1,6 @@
 """OpenAI Realtime API service for Speech-to-Text."""
 
+import io
 import json
 from typing import AsyncGenerator
 
@@ -45,10 +46,11 @@ class STTService:
                 session_id=session_id,
             )
 
-            # Collect audio chunks
-            audio_data = b""
+            # Collect audio chunks (joined once; bytes += would recopy on every chunk)
+            chunks: list[bytes] = []
             async for chunk in audio_stream:
-                audio_data += chunk
+                chunks.append(chunk)
+            audio_data = b"".join(chunks)
 
             # Transcribe using Whisper
             if audio_data:
@@ -72,8 +74,6 @@ class STTService:
             Transcribed text
         """
         try:
-            import io
-
             # Create file-like object for Whisper API
             # Whisper API accepts various formats, but we'll use WAV
             audio_io = io.BytesIO(audio_file)
@@ -1,11 +1,13 @@
 """Service for managing support tickets in the database."""
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from src.database.models import SupportTicket
+from src.services.caller_history_service import caller_history_service
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -55,62 +57,149 @@ class TicketService:
         Returns:
             SupportTicket
         """
-        stmt = select(SupportTicket).where(SupportTicket.ticket_id == ticket_id)
-        result = await session.execute(stmt)
-        record = result.scalar_one_or_none()
-
-        if record:
-            # Update existing ticket
-            record.issue_type = ticket_data.get("issue_type")
-            record.severity = severity or ticket_data.get("severity")
-            record.priority_score = priority_score
-            record.affected_systems = ticket_data.get("affected_systems", [])
-            record.error_messages = ticket_data.get("error_messages", [])
-            record.user_environment = ticket_data.get("user_environment")
-            record.steps_to_reproduce = ticket_data.get("steps_to_reproduce")
-            record.issue_description = ticket_data.get("issue_description")
-            record.status = status
-            if resolution:
-                record.resolution = resolution
-                record.resolved_at = datetime.utcnow()
-            if jira_ticket_key:
-                record.jira_ticket_key = jira_ticket_key
-            if conversation_summary:
-                record.conversation_summary = conversation_summary
-            if kb_articles_used:
-                record.kb_articles_used = kb_articles_used
-            record.updated_at = datetime.utcnow()
-            logger.info("Updated support ticket", ticket_id=ticket_id, call_sid=call_sid)
-        else:
-            # Create new ticket
-            record = SupportTicket(
-                ticket_id=ticket_id,
-                call_sid=call_sid,
-                session_id=session_id,
-                tenant_id=tenant_id,
-                from_number=from_number,
-                to_number=to_number,
-                issue_type=ticket_data.get("issue_type"),
-                severity=severity or ticket_data.get("severity"),
-                priority_score=priority_score,
-                affected_systems=ticket_data.get("affected_systems", []),
-                error_messages=ticket_data.get("error_messages", []),
-                user_environment=ticket_data.get("user_environment"),
-                steps_to_reproduce=ticket_data.get("steps_to_reproduce"),
-                issue_description=ticket_data.get("issue_description"),
-                status=status,
-                resolution=resolution,
-                resolved_at=datetime.utcnow() if resolution else None,
-                jira_ticket_key=jira_ticket_key,
-                conversation_summary=conversation_summary,
-                kb_articles_used=kb_articles_used or [],
-            )
-            session.add(record)
-            logger.info("Created support ticket", ticket_id=ticket_id, call_sid=call_sid)
+        row = self._ticket_row(
+            ticket_id=ticket_id,
+            call_sid=call_sid,
+            session_id=session_id,
+            tenant_id=tenant_id,
+            from_number=from_number,
+            to_number=to_number,
+            ticket_data=ticket_data,
+            conversation_summary=conversation_summary,
+            jira_ticket_key=jira_ticket_key,
+            priority_score=priority_score,
+            severity=severity,
+            status=status,
+            resolution=resolution,
+            kb_articles_used=kb_articles_used,
+        )
+        result = await session.execute(self._upsert_stmt([row]))
+        record, created = result.one()
 
-        await session.flush()
+        if created:
+            logger.info("Created support ticket", ticket_id=ticket_id, call_sid=call_sid)
+            # New ticket changes this caller's history summary
+            await caller_history_service.invalidate(from_number, tenant_id)
+        else:
+            logger.info("Updated support ticket", ticket_id=ticket_id, call_sid=call_sid)
         return record
 
+    async def bulk_create_or_update_tickets(
+        self,
+        session: AsyncSession,
+        tickets: list[dict],
+    ) -> list[SupportTicket]:
+        """
+        Create or update many support tickets in a single statement.
+
+        Args:
+            session: Database session
+            tickets: Keyword arguments of create_or_update_ticket (without session), one dict per ticket
+
+        Returns:
+            List of SupportTicket objects
+        """
+        # One INSERT can't touch the same row twice; the last entry per ticket wins
+        rows = list({t["ticket_id"]: self._ticket_row(**t) for t in tickets}.values())
+        if not rows:
+            return []
+
+        result = await session.execute(self._upsert_stmt(rows))
+        records = []
+        invalidate = set()
+        for record, created in result.all():
+            records.append(record)
+            if created:
+                invalidate.add((record.from_number, record.tenant_id))
+
+        for from_number, tenant_id in invalidate:
+            await caller_history_service.invalidate(from_number, tenant_id)
+        logger.info("Upserted support tickets", count=len(records), created=len(invalidate))
+        return records
+
+    @staticmethod
+    def _ticket_row(
+        ticket_id: str,
+        call_sid: str,
+        session_id: str,
+        tenant_id: str,
+        from_number: str,
+        to_number: str,
+        ticket_data: dict,
+        conversation_summary: Optional[str] = None,
+        jira_ticket_key: Optional[str] = None,
+        priority_score: Optional[int] = None,
+        severity: Optional[str] = None,
+        status: str = "open",
+        resolution: Optional[str] = None,
+        kb_articles_used: Optional[list[str]] = None,
+    ) -> dict:
+        """Build the INSERT values for one ticket."""
+        return {
+            "ticket_id": ticket_id,
+            "call_sid": call_sid,
+            "session_id": session_id,
+            "tenant_id": tenant_id,
+            "from_number": from_number,
+            "to_number": to_number,
+            "issue_type": ticket_data.get("issue_type"),
+            "severity": severity or ticket_data.get("severity"),
+            "priority_score": priority_score,
+            "affected_systems": ticket_data.get("affected_systems", []),
+            "error_messages": ticket_data.get("error_messages", []),
+            "user_environment": ticket_data.get("user_environment"),
+            "steps_to_reproduce": ticket_data.get("steps_to_reproduce"),
+            "issue_description": ticket_data.get("issue_description"),
+            "status": status,
+            "resolution": resolution or None,
+            "resolved_at": datetime.now(UTC) if resolution else None,
+            "jira_ticket_key": jira_ticket_key or None,
+            "conversation_summary": conversation_summary or None,
+            "kb_articles_used": kb_articles_used or [],
+            "extra_data": {},
+        }
+
+    @staticmethod
+    def _upsert_stmt(rows: list[dict]):
+        """
+        INSERT ... ON CONFLICT (ticket_id) DO UPDATE for the given rows.
+
+        Ticket fields are always overwritten; resolution, Jira key, summary and
+        KB articles only when a new value is given. Returns (SupportTicket, created).
+        """
+        table = SupportTicket.__table__
+        stmt = pg_insert(SupportTicket).values(rows)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SupportTicket.ticket_id],
+            set_={
+                "issue_type": excluded.issue_type,
+                "severity": excluded.severity,
+                "priority_score": excluded.priority_score,
+                "affected_systems": excluded.affected_systems,
+                "error_messages": excluded.error_messages,
+                "user_environment": excluded.user_environment,
+                "steps_to_reproduce": excluded.steps_to_reproduce,
+                "issue_description": excluded.issue_description,
+                "status": excluded.status,
+                "resolution": func.coalesce(excluded.resolution, table.c.resolution),
+                "resolved_at": func.coalesce(excluded.resolved_at, table.c.resolved_at),
+                "jira_ticket_key": func.coalesce(excluded.jira_ticket_key, table.c.jira_ticket_key),
+                "conversation_summary": func.coalesce(
+                    excluded.conversation_summary, table.c.conversation_summary),
+                "kb_articles_used": func.coalesce(
+                    # Omitted KB articles (an empty array) keep the stored list
+                    func.nullif(excluded.kb_articles_used, func.jsonb_build_array()),
+                    table.c.kb_articles_used,
+                ),
+            },
+        )
+        # xmax is 0 only for rows this statement inserted
+        return (
+            stmt.returning(SupportTicket, literal_column("xmax = 0").label("created"))
+            .execution_options(populate_existing=True)
+        )
+
     async def get_ticket_by_ticket_id(
         self,
         session: AsyncSession,
@@ -166,6 +255,7 @@ class TicketService:
         Returns:
             List of SupportTicket objects
         """
+        # Served by ix_st_caller_hist with a tenant, ix_st_phone_created without
         stmt = select(SupportTicket).where(SupportTicket.from_number == from_number)
         if tenant_id:
             stmt = stmt.where(SupportTicket.tenant_id == tenant_id)
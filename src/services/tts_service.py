@@ -1,5 +1,10 @@
 """ElevenLabs TTS service for text-to-speech conversion."""
 
+import asyncio
+import hashlib
+from typing import AsyncIterator
+
+import redis.asyncio as redis
 from elevenlabs.client import ElevenLabs
 
 from src.core.config import settings
@@ -18,6 +23,12 @@ class TTSService:
         self.client = ElevenLabs(
             api_key=settings.ELEVENLABS_API_KEY) if settings.ELEVENLABS_API_KEY else None
         self.voice_id = settings.ELEVENLABS_VOICE_ID
+        self.model_id = "eleven_multilingual_v2"
+        # Fixed prompts (greetings, confirmations) are served from Redis by content hash.
+        # Long texts are almost always one-off agent responses, so they are not cached.
+        self.redis_client: redis.Redis | None = None
+        self.cache_ttl = 86400  # 1 day
+        self.cache_max_text_length = 512
         logger.info("TTS Service initialized", voice_id=self.voice_id,
                     has_api_key=bool(settings.ELEVENLABS_API_KEY))
 
@@ -47,7 +58,7 @@ class TTSService:
                 audio_generator = self.client.text_to_speech.convert(
                     voice_id=voice,
                     text=text,
-                    model_id="eleven_multilingual_v2",
+                    model_id=self.model_id,
                 )
                 audio_bytes = b"".join(audio_generator)
             except AttributeError:
@@ -56,7 +67,7 @@ class TTSService:
                 audio_generator = generate(
                     text=text,
                     voice=voice,
-                    model="eleven_multilingual_v2",
+                    model=self.model_id,
                 )
                 audio_bytes = b"".join(audio_generator)
 
@@ -68,6 +79,45 @@ class TTSService:
             logger.error("TTS generation error", error=str(e), text=text[:50])
             raise
 
+    def _cache_key(self, text: str, voice: str) -> str:
+        digest = hashlib.sha256(f"{voice}|{self.model_id}|{text}".encode()).hexdigest()
+        return f"tts:{digest}"
+
+    async def generate_audio_async(self, text: str, voice_id: str | None = None) -> bytes:
+        """
+        Generate audio without blocking the event loop, reusing cached audio for repeated prompts.
+
+        Args:
+            text: Text to convert to speech
+            voice_id: Optional voice ID (defaults to configured voice)
+
+        Returns:
+            Audio bytes (MP3 format)
+        """
+        voice = voice_id or settings.ELEVENLABS_VOICE_ID
+        cacheable = len(text) < self.cache_max_text_length
+        key = self._cache_key(text, voice) if cacheable else None
+
+        if key:
+            try:
+                if not self.redis_client:
+                    self.redis_client = redis.from_url(settings.redis_url)
+                cached = await self.redis_client.get(key)
+                if cached:
+                    logger.debug("TTS cache hit", text_length=len(text), voice_id=voice)
+                    return cached
+            except Exception as e:
+                logger.warning("TTS cache read failed", error=str(e))
+
+        audio = await asyncio.to_thread(self.generate_audio, text, voice)
+
+        if key and audio:
+            try:
+                await self.redis_client.set(key, audio, ex=self.cache_ttl)
+            except Exception as e:
+                logger.warning("TTS cache write failed", error=str(e))
+        return audio
+
     def generate_audio_stream(self, text: str, voice_id: str | None = None):
         """
         Generate streaming audio from text.
@@ -89,7 +139,7 @@ class TTSService:
                 audio_stream = self.client.text_to_speech.convert_as_stream(
                     voice_id=voice,
                     text=text,
-                    model_id="eleven_multilingual_v2",
+                    model_id=self.model_id,
                 )
             except AttributeError:
                 # Fallback to older API
@@ -97,17 +147,47 @@ class TTSService:
                 audio_stream = generate(
                     text=text,
                     voice=voice,
-                    model="eleven_multilingual_v2",
+                    model=self.model_id,
                     stream=True,
                 )
 
-            for chunk in audio_stream:
-                yield chunk
+            try:
+                for chunk in audio_stream:
+                    yield chunk
+            finally:
+                # Release the SDK's HTTP response when the consumer stops early
+                if hasattr(audio_stream, "close"):
+                    audio_stream.close()
 
         except Exception as e:
             logger.error("Streaming TTS error", error=str(e), text=text[:50])
             raise
 
+    async def generate_audio_stream_async(
+        self,
+        text: str,
+        voice_id: str | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream audio chunks as ElevenLabs produces them, without blocking the event loop.
+
+        Args:
+            text: Text to convert to speech
+            voice_id: Optional voice ID
+
+        Yields:
+            Audio chunks (bytes, MP3 format)
+        """
+        chunks = self.generate_audio_stream(text, voice_id)
+        # The SDK stream is a blocking iterator; pull each chunk on a worker thread
+        try:
+            while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+                if chunk:
+                    yield chunk
+        finally:
+            # aclose() on this wrapper doesn't reach the sync generator by itself
+            chunks.close()
+
     def get_available_voices(self) -> list[dict]:
         """
         Get list of available voices.
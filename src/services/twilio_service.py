@@ -1,21 +1,50 @@
 """Twilio Voice service for handling phone calls."""
 
+import asyncio
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
-from twilio.twiml.voice_response import VoiceResponse
 
 from src.core.config import settings
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Statuses after which a call no longer changes
+TERMINAL_CALL_STATUSES = {"completed", "busy", "failed", "no-answer", "canceled"}
+
+GREETING_TEXT = "Hello! Thanks for calling. I'll ask you a few quick questions to get started. Sound good?"
+
+_TWIML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>'
+
+
+def say_twiml(text: str) -> str:
+    """Render a single <Say> TwiML document."""
+    return f'{_TWIML_HEADER}<Response><Say language="en-US" voice="alice">{escape(text)}</Say></Response>'
+
 
 class TwilioService:
     """Service for Twilio Voice operations."""
 
     def __init__(self):
         """Initialize Twilio client."""
-        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        # Keep-alive session sized for concurrent fetches from worker threads
+        http_client = TwilioHttpClient(pool_connections=True, timeout=10)
+        http_client.session.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32))
+        self.client = Client(
+            settings.TWILIO_ACCOUNT_SID,
+            settings.TWILIO_AUTH_TOKEN,
+            http_client=http_client,
+        )
         self.phone_number = settings.TWILIO_PHONE_NUMBER
+        # Finished calls are immutable, so their info is kept (LRU-bounded)
+        self._call_cache: OrderedDict[str, dict] = OrderedDict()
+        self._call_cache_max = 4096
+        # Constant TwiML is rendered once instead of rebuilding an XML tree per call
+        self._greeting_twiml = say_twiml(GREETING_TEXT)
 
     def create_voice_response(self, text: str, voice_url: str | None = None) -> str:
         """
@@ -28,16 +57,11 @@ class TwilioService:
         Returns:
             TwiML XML string
         """
-        response = VoiceResponse()
-
         if voice_url:
             # Play audio from URL (ElevenLabs TTS)
-            response.play(voice_url)
-        else:
-            # Fallback: use Twilio TTS
-            response.say(text, voice="alice", language="en-US")
-
-        return str(response)
+            return f"{_TWIML_HEADER}<Response><Play>{escape(voice_url)}</Play></Response>"
+        # Fallback: use Twilio TTS
+        return say_twiml(text)
 
     def handle_incoming_call(self, call_sid: str, from_number: str, to_number: str) -> str:
         """
@@ -58,17 +82,9 @@ class TwilioService:
             to_number=to_number,
         )
 
-        # Create initial greeting response
-        response = VoiceResponse()
-        response.say(
-            "Hello! Thanks for calling. I'll ask you a few quick questions to get started. Sound good?",
-            voice="alice",
-            language="en-US",
-        )
-
         # Start gathering input (will be handled by streaming endpoint)
-        # For now, return simple response
-        return str(response)
+        # For now, return simple greeting response
+        return self._greeting_twiml
 
     def handle_status_callback(
         self,
@@ -91,19 +107,26 @@ class TwilioService:
             duration=duration,
         )
 
-    def get_call_info(self, call_sid: str) -> dict:
+    async def get_call_info(self, call_sid: str) -> dict:
         """
         Get call information from Twilio.
 
+        Calls in a terminal status are served from memory after the first fetch.
+
         Args:
             call_sid: Twilio Call SID
 
         Returns:
             Call information dictionary
         """
+        cached = self._call_cache.get(call_sid)
+        if cached is not None:
+            self._call_cache.move_to_end(call_sid)
+            return cached
+
         try:
-            call = self.client.calls(call_sid).fetch()
-            return {
+            call = await asyncio.to_thread(self.client.calls(call_sid).fetch)
+            info = {
                 "sid": call.sid,
                 "status": call.status,
                 "from": call.from_,
@@ -116,6 +139,12 @@ class TwilioService:
             logger.error("Failed to fetch call info", call_sid=call_sid, error=str(e))
             raise
 
+        if info["status"] in TERMINAL_CALL_STATUSES:
+            self._call_cache[call_sid] = info
+            if len(self._call_cache) > self._call_cache_max:
+                self._call_cache.popitem(last=False)
+        return info
+
 
 # Singleton instance
 twilio_service = TwilioService()
@@ -0,0 +1,302 @@
+"""Alternative vector storage backends for tenants that outgrow Chroma."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+from sqlalchemy import text
+
+from src.core.config import settings
+from src.core.logging import get_logger
+from src.database.connection import engine
+
+logger = get_logger(__name__)
+
+PGVECTOR_TABLE = "kb_vectors"
+
+# Column type and HNSW operator class per KB_PGVECTOR_QUANT setting. halfvec
+# stores 2 bytes per dimension, halving table and index size.
+_PGVECTOR_TYPES = {
+    "fp32": ("vector", "vector_cosine_ops"),
+    "fp16": ("halfvec", "halfvec_cosine_ops"),
+}
+
+
+class BaseVectorBackend(ABC):
+    """
+    Storage interface behind VectorStore.
+
+    Results use Chroma's query shape ('ids', 'documents', 'metadatas',
+    'distances', one list per query vector) so callers don't care which
+    backend served a tenant.
+    """
+
+    @abstractmethod
+    async def get_or_create(self, tenant_id: str) -> None:
+        """Make sure storage for the tenant exists."""
+
+    @abstractmethod
+    async def add_documents(
+        self,
+        tenant_id: str,
+        ids: List[str],
+        documents: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Insert or replace rows by ID."""
+
+    @abstractmethod
+    async def query(
+        self,
+        tenant_id: str,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        search_ef: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Nearest neighbours for each row of query_embeddings."""
+
+    @abstractmethod
+    async def delete(self, tenant_id: str) -> None:
+        """Remove all of a tenant's rows."""
+
+    @abstractmethod
+    async def count(self, tenant_id: str) -> int:
+        """Number of rows stored for the tenant."""
+
+
+def _vector_literal(vector: np.ndarray) -> str:
+    """Format a vector in pgvector's text input format."""
+    return "[" + ",".join(map(str, vector.tolist())) + "]"
+
+
+def _json_text(value: Any) -> str:
+    """Text form of a JSON scalar, as returned by Postgres' ->> operator."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _where_sql(where: Optional[Dict[str, Any]], params: Dict[str, Any]) -> List[str]:
+    """
+    Translate a Chroma-style metadata filter into SQL conditions.
+
+    Supports plain equality, $eq, $in and $and, which covers the filters the
+    retrieval service builds.
+
+    Args:
+        where: Chroma metadata filter
+        params: Bind parameters, extended in place
+
+    Returns:
+        SQL conditions to AND together
+    """
+    clauses: List[str] = []
+    for key, condition in (where or {}).items():
+        if key == "$and":
+            for sub in condition:
+                clauses.extend(_where_sql(sub, params))
+            continue
+
+        n = len(params)
+        if isinstance(condition, dict):
+            op, value = next(iter(condition.items()))
+        else:
+            op, value = "$eq", condition
+
+        if op == "$eq":
+            params[f"w{n}"] = orjson.dumps({key: value}).decode()
+            clauses.append(f"metadata @> CAST(CAST(:w{n} AS text) AS jsonb)")
+        elif op == "$in":
+            params[f"k{n}"] = key
+            params[f"w{n}"] = [_json_text(v) for v in value]
+            clauses.append(f"metadata ->> :k{n} = ANY(:w{n})")
+        else:
+            raise ValueError(f"Unsupported metadata filter operator for pgvector: {op}")
+    return clauses
+
+
+class PgVectorBackend(BaseVectorBackend):
+    """Postgres/pgvector storage with an HNSW cosine index, for large tenants."""
+
+    def __init__(self):
+        """Initialize backend; the table and index are created on first use."""
+        self._schema_ready = False
+        self._schema_lock = asyncio.Lock()
+        try:
+            self._column_type, self._opclass = _PGVECTOR_TYPES[settings.KB_PGVECTOR_QUANT]
+        except KeyError:
+            raise ValueError(f"Unsupported KB_PGVECTOR_QUANT: {settings.KB_PGVECTOR_QUANT}") from None
+
+    async def get_or_create(self, tenant_id: str) -> None:
+        """
+        Create the shared vector table and its HNSW index if missing.
+
+        All pgvector tenants share one table keyed by (tenant_id, id).
+
+        Args:
+            tenant_id: Tenant identifier
+        """
+        if self._schema_ready:
+            return
+
+        async with self._schema_lock:
+            if self._schema_ready:
+                return
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                await conn.execute(text(f"""
+                    CREATE TABLE IF NOT EXISTS {PGVECTOR_TABLE} (
+                        tenant_id VARCHAR(50) NOT NULL,
+                        id VARCHAR(200) NOT NULL,
+                        document TEXT NOT NULL,
+                        metadata JSONB DEFAULT '{{}}' NOT NULL,
+                        embedding {self._column_type}({int(settings.KB_PGVECTOR_DIMENSIONS)}) NOT NULL,
+                        PRIMARY KEY (tenant_id, id)
+                    )
+                """))
+                await conn.execute(text(f"""
+                    CREATE INDEX IF NOT EXISTS ix_{PGVECTOR_TABLE}_embedding
+                    ON {PGVECTOR_TABLE} USING hnsw (embedding {self._opclass})
+                    WITH (m = {int(settings.KB_HNSW_M)},
+                          ef_construction = {int(settings.KB_PGVECTOR_CONSTRUCTION_EF)})
+                """))
+            self._schema_ready = True
+            logger.info("pgvector schema ready", table=PGVECTOR_TABLE, tenant_id=tenant_id)
+
+    async def add_documents(
+        self,
+        tenant_id: str,
+        ids: List[str],
+        documents: List[str],
+        embeddings: np.ndarray,
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Upsert rows for a tenant.
+
+        Args:
+            tenant_id: Tenant identifier
+            ids: Row IDs
+            documents: Document texts
+            embeddings: 2-D float32 array, one row per document
+            metadatas: Metadata dictionaries
+        """
+        await self.get_or_create(tenant_id)
+        rows = [
+            {
+                "tenant_id": tenant_id,
+                "id": row_id,
+                "document": document,
+                "metadata": orjson.dumps(metadata).decode(),
+                "embedding": _vector_literal(vector),
+            }
+            for row_id, document, vector, metadata in zip(ids, documents, embeddings, metadatas)
+        ]
+        if not rows:
+            return
+
+        async with engine.begin() as conn:
+            await conn.execute(text(f"""
+                INSERT INTO {PGVECTOR_TABLE} (tenant_id, id, document, metadata, embedding)
+                VALUES (:tenant_id, :id, :document,
+                        CAST(CAST(:metadata AS text) AS jsonb),
+                        CAST(CAST(:embedding AS text) AS {self._column_type}))
+                ON CONFLICT (tenant_id, id) DO UPDATE SET
+                    document = EXCLUDED.document,
+                    metadata = EXCLUDED.metadata,
+                    embedding = EXCLUDED.embedding
+            """), rows)
+
+    async def query(
+        self,
+        tenant_id: str,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        where: Optional[Dict[str, Any]] = None,
+        search_ef: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Nearest neighbours by cosine distance, using the HNSW index.
+
+        Args:
+            tenant_id: Tenant identifier
+            query_embeddings: 2-D float32 array of query vectors
+            n_results: Number of results per query
+            where: Optional Chroma-style metadata filter
+            search_ef: Optional HNSW search breadth (defaults to KB_HNSW_SEARCH_EF)
+
+        Returns:
+            Dictionary with 'ids', 'documents', 'metadatas', 'distances'
+        """
+        await self.get_or_create(tenant_id)
+        params: Dict[str, Any] = {"tenant_id": tenant_id, "n_results": n_results}
+        conditions = ["tenant_id = :tenant_id", *_where_sql(where, params)]
+        params["queries"] = [_vector_literal(vector) for vector in query_embeddings]
+        # One round-trip for the whole batch: each query vector drives its own
+        # index scan through the LATERAL subquery
+        statement = text(f"""
+            SELECT q.ord, m.id, m.document, m.metadata, m.distance
+            FROM unnest(CAST(:queries AS text[])) WITH ORDINALITY AS q(vec, ord)
+            CROSS JOIN LATERAL (
+                SELECT id, document, CAST(metadata AS text) AS metadata,
+                       embedding <=> CAST(q.vec AS {self._column_type}) AS distance
+                FROM {PGVECTOR_TABLE}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY embedding <=> CAST(q.vec AS {self._column_type})
+                LIMIT :n_results
+            ) AS m
+            ORDER BY q.ord, m.distance
+        """)
+
+        n_queries = len(params["queries"])
+        results: Dict[str, Any] = {
+            field: [[] for _ in range(n_queries)]
+            for field in ("ids", "documents", "metadatas", "distances")
+        }
+        async with engine.begin() as conn:
+            # SET LOCAL scopes the search breadth to this transaction only
+            ef = int(search_ef or settings.KB_HNSW_SEARCH_EF)
+            await conn.execute(text(f"SET LOCAL hnsw.ef_search = {ef}"))
+            for row in await conn.execute(statement, params):
+                i = row.ord - 1
+                results["ids"][i].append(row.id)
+                results["documents"][i].append(row.document)
+                results["metadatas"][i].append(orjson.loads(row.metadata))
+                results["distances"][i].append(float(row.distance))
+        return results
+
+    async def delete(self, tenant_id: str) -> None:
+        """
+        Remove all of a tenant's rows.
+
+        Args:
+            tenant_id: Tenant identifier
+        """
+        await self.get_or_create(tenant_id)
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(f"DELETE FROM {PGVECTOR_TABLE} WHERE tenant_id = :tenant_id"),
+                {"tenant_id": tenant_id},
+            )
+
+    async def count(self, tenant_id: str) -> int:
+        """
+        Number of rows stored for a tenant.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            Row count
+        """
+        await self.get_or_create(tenant_id)
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text(f"SELECT count(*) FROM {PGVECTOR_TABLE} WHERE tenant_id = :tenant_id"),
+                {"tenant_id": tenant_id},
+            )
+            return int(result.scalar_one())
@@ -1,17 +1,59 @@
 """Vector store service using ChromaDB for multi-tenant knowledge base."""
 
+import asyncio
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings as ChromaSettings
 from chromadb import Collection
 
 from src.core.config import settings
 from src.core.logging import get_logger
+from src.services.vector_backends import PgVectorBackend
 
 logger = get_logger(__name__)
 
+# Rows per collection write; each call is one SQLite transaction in Chroma
+BATCH_SIZE = 200
+
+# Collection holding every tenant that is not sharded out in shared mode
+SHARED_COLLECTION_NAME = "kb_shared"
+TENANT_COLLECTION_PREFIX = "kb_tenant_"
+
+# How long a list_collections() snapshot answers existence checks for stats
+COLLECTION_LIST_TTL = 5.0
+
+
+@lru_cache(maxsize=4096)
+def _tenant_collection_name(tenant_id: str) -> str:
+    """Interned per-tenant collection name, built once per tenant."""
+    return sys.intern(f"{TENANT_COLLECTION_PREFIX}{tenant_id}")
+
+
+def _unit_rows(vectors: Union[List[float], List[List[float]], np.ndarray]) -> np.ndarray:
+    """
+    Coerce vectors to float32 and scale each row to unit length.
+
+    With unit vectors, inner product equals cosine similarity, so collections
+    can use the cheaper "ip" space. Zero vectors are left as-is.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    # Out-of-place so a caller's array is never modified
+    return np.ascontiguousarray(vectors / norms)
+
 
 class VectorStore:
     """ChromaDB wrapper for multi-tenant vector storage and retrieval."""
@@ -24,18 +66,126 @@ class VectorStore:
             persist_directory: Directory to persist ChromaDB data
         """
         self.persist_dir = Path(persist_directory or settings.CHROMA_PERSIST_DIR)
-        self.persist_dir.mkdir(parents=True, exist_ok=True)
 
-        self.client = chromadb.PersistentClient(
-            path=str(self.persist_dir),
-            settings=ChromaSettings(anonymized_telemetry=False)
-        )
+        # With a Chroma server, request paths use the async client so writes and
+        # queries don't occupy worker threads; the sync client stays for CLI usage
+        self.async_mode = bool(settings.CHROMA_HOST)
+        if self.async_mode:
+            self.client = chromadb.HttpClient(
+                host=settings.CHROMA_HOST,
+                port=settings.CHROMA_PORT,
+                settings=ChromaSettings(anonymized_telemetry=False),
+            )
+        else:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            self.client = chromadb.PersistentClient(
+                path=str(self.persist_dir),
+                settings=ChromaSettings(anonymized_telemetry=False)
+            )
+            self._enable_wal()
+        self._async_client = None
+        self._async_client_lock = asyncio.Lock()
+        self._async_collections: Dict[str, Any] = {}
+
+        # Tenants listed in KB_PGVECTOR_TENANTS are served from Postgres instead
+        self._pgvector = PgVectorBackend()
+
+        # Collection handles per tenant; skips a sysdb lookup on every request
+        self._collections: Dict[str, Collection] = {}
+        self._collections_lock = threading.Lock()
+        self._listed_names: set[str] = set()
+        self._listed_at = float("-inf")
+
+        # Exact-match LRU of query results. Keys include a per-tenant generation
+        # that every write bumps, so results never outlive a change to the collection.
+        self._query_cache: OrderedDict[bytes, tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._generations: Dict[str, int] = defaultdict(int)
+
+        logger.info("Vector store initialized", persist_dir=str(self.persist_dir),
+                    chroma_host=settings.CHROMA_HOST)
+
+    def _enable_wal(self) -> None:
+        """
+        Switch Chroma's SQLite store to write-ahead logging.
 
-        logger.info("Vector store initialized", persist_dir=str(self.persist_dir))
+        WAL is a persistent property of the database file, so setting it once from
+        a separate connection applies to Chroma's own connections: writers append
+        to the log instead of rewriting pages under a rollback journal, and readers
+        are not blocked during ingestion.
+        """
+        db_path = self.persist_dir / "chroma.sqlite3"
+        try:
+            with closing(sqlite3.connect(db_path)) as conn:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            logger.debug("Vector store journal mode set", journal_mode=mode)
+        except sqlite3.Error as e:
+            logger.warning("Failed to enable WAL on vector store", error=str(e))
 
     def get_collection_name(self, tenant_id: str) -> str:
         """Get collection name for tenant (multi-tenant support)."""
-        return f"kb_tenant_{tenant_id}"
+        if self._is_shared(tenant_id):
+            return SHARED_COLLECTION_NAME
+        return _tenant_collection_name(tenant_id)
+
+    @staticmethod
+    def _is_shared(tenant_id: str) -> bool:
+        """Whether the tenant lives in the shared collection, filtered by tenant_id metadata."""
+        return (
+            settings.KB_SHARD_MODE == "shared"
+            and tenant_id not in settings.KB_DEDICATED_TENANTS
+            and tenant_id not in settings.KB_PGVECTOR_TENANTS
+        )
+
+    @staticmethod
+    def _uses_pgvector(tenant_id: str) -> bool:
+        """Whether the tenant is served by the pgvector backend rather than Chroma."""
+        return tenant_id in settings.KB_PGVECTOR_TENANTS
+
+    def _scoped_where(self, tenant_id: str, where: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Restrict a metadata filter to the tenant when its collection is shared."""
+        if not self._is_shared(tenant_id):
+            return where
+        if not where:
+            return {"tenant_id": tenant_id}
+        # One clause per key: Chroma requires $and to combine multiple conditions
+        return {"$and": [{"tenant_id": tenant_id}, *({k: v} for k, v in where.items())]}
+
+    def _invalidate_queries(self, tenant_id: str) -> None:
+        with self._query_cache_lock:
+            self._generations[tenant_id] += 1
+
+    def _query_cache_key(
+        self,
+        tenant_id: str,
+        query_vector: np.ndarray,
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        search_ef: Optional[int],
+    ) -> bytes:
+        h = hashlib.blake2b(query_vector.tobytes(), digest_size=16)
+        h.update(f"|{tenant_id}|{self._generations[tenant_id]}|{n_results}|{search_ef}|{where!r}".encode())
+        return h.digest()
+
+    @staticmethod
+    def _hnsw_metadata() -> Dict[str, Any]:
+        """HNSW build/search parameters applied when a collection is created."""
+        return {
+            "hnsw:space": settings.KB_HNSW_SPACE,
+            "hnsw:M": settings.KB_HNSW_M,
+            "hnsw:construction_ef": settings.KB_HNSW_CONSTRUCTION_EF,
+            "hnsw:search_ef": settings.KB_HNSW_SEARCH_EF,
+            "hnsw:num_threads": settings.KB_HNSW_NUM_THREADS or os.cpu_count() or 1,
+        }
+
+    def _collection_metadata(self, tenant_id: str) -> Dict[str, Any]:
+        if self._is_shared(tenant_id):
+            return {"description": "Shared knowledge base for small tenants", **self._hnsw_metadata()}
+        return {
+            "tenant_id": tenant_id,
+            "description": f"Knowledge base for tenant {tenant_id}",
+            **self._hnsw_metadata(),
+        }
 
     def get_or_create_collection(self, tenant_id: str) -> Collection:
         """
@@ -47,24 +197,98 @@ class VectorStore:
         Returns:
             ChromaDB Collection
         """
-        collection_name = self.get_collection_name(tenant_id)
-        try:
-            collection = self.client.get_collection(name=collection_name)
-            logger.debug("Retrieved existing collection", tenant_id=tenant_id, collection=collection_name)
-        except Exception:
-            collection = self.client.create_collection(
+        if self._uses_pgvector(tenant_id):
+            # pgvector is async-only; callers must go through the a* methods
+            raise ValueError(f"Tenant {tenant_id} is served by pgvector, use the async API")
+
+        collection = self._collections.get(tenant_id)
+        if collection is not None:
+            return collection
+
+        # Called from worker threads; the lock keeps concurrent misses from racing create
+        with self._collections_lock:
+            collection = self._collections.get(tenant_id)
+            if collection is not None:
+                return collection
+
+            collection_name = self.get_collection_name(tenant_id)
+            # Atomic in Chroma; metadata only applies when the collection is created.
+            # Unlike get-then-create, real lookup errors propagate instead of
+            # being mistaken for a missing collection.
+            collection = self.client.get_or_create_collection(
                 name=collection_name,
-                metadata={"tenant_id": tenant_id, "description": f"Knowledge base for tenant {tenant_id}"},
+                metadata=self._collection_metadata(tenant_id),
             )
-            logger.info("Created new collection", tenant_id=tenant_id, collection=collection_name)
+            logger.info("Loaded collection", tenant_id=tenant_id, collection=collection_name)
 
-        return collection
+            self._collections[tenant_id] = collection
+            self._listed_at = float("-inf")
+            return collection
+
+    def _prepare_rows(
+        self,
+        tenant_id: str,
+        documents: List[str],
+        embeddings: Union[List[List[float]], np.ndarray],
+        metadatas: List[Dict[str, Any]],
+        ids: Optional[List[str]],
+    ) -> tuple[List[str], np.ndarray, List[Dict[str, Any]]]:
+        shared = self._is_shared(tenant_id)
+        if ids is None:
+            # Content-addressed IDs: re-adding an unchanged document is an idempotent upsert
+            ids = [hashlib.blake2b(d.encode("utf-8"), digest_size=16).hexdigest() for d in documents]
+            if shared:
+                ids = [f"{tenant_id}:{i}" for i in ids]
+        if shared:
+            metadatas = [{**m, "tenant_id": tenant_id} for m in metadatas]
+        # One float32 array, sliced per batch, instead of nested Python float lists
+        return ids, _unit_rows(embeddings), metadatas
+
+    def _cached_query(self, cache_key: bytes, now: float) -> Optional[Dict[str, Any]]:
+        with self._query_cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None and now - cached[0] < settings.KB_QUERY_CACHE_TTL:
+                self._query_cache.move_to_end(cache_key)
+                return cached[1]
+        return None
+
+    def _store_query(self, cache_key: bytes, now: float, results: Dict[str, Any]) -> None:
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = (now, results)
+            if len(self._query_cache) > settings.KB_QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+    @staticmethod
+    def _distance_cutoff(max_distance: Optional[float], min_similarity: Optional[float]) -> Optional[float]:
+        """Combine a distance cutoff and a similarity floor (distance = 1 - similarity)."""
+        if min_similarity is None:
+            return max_distance
+        if max_distance is None:
+            return 1.0 - min_similarity
+        return min(max_distance, 1.0 - min_similarity)
+
+    @staticmethod
+    def _within(results: Dict[str, Any], max_distance: Optional[float]) -> Dict[str, Any]:
+        """
+        Drop matches beyond max_distance from every per-query result list.
+
+        Returns a new dict so cached results are never trimmed in place.
+        """
+        if max_distance is None or not results.get("distances"):
+            return results
+        keep = [[j for j, d in enumerate(row) if d <= max_distance] for row in results["distances"]]
+        filtered = dict(results)
+        for field in ("ids", "documents", "metadatas", "distances", "embeddings"):
+            rows = results.get(field)
+            if rows is not None:
+                filtered[field] = [[row[j] for j in idx] for row, idx in zip(rows, keep)]
+        return filtered
 
     def add_documents(
         self,
         tenant_id: str,
         documents: List[str],
-        embeddings: List[List[float]],
+        embeddings: Union[List[List[float]], np.ndarray],
         metadatas: List[Dict[str, Any]],
         ids: Optional[List[str]] = None,
     ) -> None:
@@ -74,53 +298,251 @@ class VectorStore:
         Args:
             tenant_id: Tenant identifier
             documents: List of document texts
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors (list of lists or a 2-D array)
             metadatas: List of metadata dictionaries
-            ids: Optional list of document IDs
+            ids: Optional list of document IDs (defaults to content hashes)
         """
         collection = self.get_or_create_collection(tenant_id)
+        ids, vectors, metadatas = self._prepare_rows(tenant_id, documents, embeddings, metadatas, ids)
+
+        for start in range(0, len(documents), BATCH_SIZE):
+            stop = start + BATCH_SIZE
+            started = time.perf_counter()
+            collection.upsert(
+                documents=documents[start:stop],
+                embeddings=vectors[start:stop],
+                metadatas=metadatas[start:stop],
+                ids=ids[start:stop],
+            )
+            logger.debug("Vector store batch written", tenant_id=tenant_id,
+                         count=len(ids[start:stop]),
+                         duration_ms=round((time.perf_counter() - started) * 1000, 1))
 
-        if ids is None:
-            ids = [f"doc_{i}" for i in range(len(documents))]
-
-        collection.add(
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            ids=ids,
-        )
+        self._invalidate_queries(tenant_id)
 
         logger.info("Added documents to vector store", tenant_id=tenant_id, count=len(documents))
 
     def query(
         self,
         tenant_id: str,
-        query_embeddings: List[float],
+        query_embeddings: Union[List[float], List[List[float]], np.ndarray],
         n_results: int = 3,
         where: Optional[Dict[str, Any]] = None,
+        search_ef: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Query the vector store for similar documents.
 
         Args:
             tenant_id: Tenant identifier
-            query_embeddings: Query embedding vector
+            query_embeddings: One query vector, or a batch of them (list of lists
+                or 2-D array) answered against the same index in one call
             n_results: Number of results to return
             where: Optional metadata filter
+            search_ef: Optional HNSW search breadth for pgvector tenants; trades
+                latency for recall. Chroma collections use KB_HNSW_SEARCH_EF.
+            max_distance: Optional cutoff; matches further away are dropped
+            min_similarity: Optional cosine similarity floor, i.e.
+                max_distance = 1 - min_similarity
 
         Returns:
-            Dictionary with 'ids', 'documents', 'metadatas', 'distances'
+            Dictionary with 'ids', 'documents', 'metadatas', 'distances', each
+            holding one result list per query vector
         """
+        max_distance = self._distance_cutoff(max_distance, min_similarity)
+        query_vector = _unit_rows(query_embeddings)
+        cache_key = self._query_cache_key(tenant_id, query_vector, n_results, where, search_ef)
+        now = time.monotonic()
+        cached = self._cached_query(cache_key, now)
+        if cached is not None:
+            logger.debug("Vector store query cache hit", tenant_id=tenant_id)
+            return self._within(cached, max_distance)
+
+        # Chroma's search breadth is KB_HNSW_SEARCH_EF, fixed when the collection
+        # is created: changing it means a persistent metadata write shared by every
+        # query (and every tenant in a shared shard), so search_ef is not applied here
         collection = self.get_or_create_collection(tenant_id)
 
         results = collection.query(
-            query_embeddings=[query_embeddings],
+            query_embeddings=np.atleast_2d(query_vector),
             n_results=n_results,
-            where=where,
+            where=self._scoped_where(tenant_id, where),
         )
 
         logger.debug("Queried vector store", tenant_id=tenant_id, n_results=len(results.get("ids", [])[0] if results.get("ids") else []))
-        return results
+
+        self._store_query(cache_key, now, results)
+        return self._within(results, max_distance)
+
+    async def _get_async_collection(self, tenant_id: str):
+        """Get or create a tenant's collection through the async client."""
+        collection = self._async_collections.get(tenant_id)
+        if collection is not None:
+            return collection
+
+        if self._async_client is None:
+            async with self._async_client_lock:
+                if self._async_client is None:
+                    self._async_client = await chromadb.AsyncHttpClient(
+                        host=settings.CHROMA_HOST,
+                        port=settings.CHROMA_PORT,
+                        settings=ChromaSettings(anonymized_telemetry=False),
+                    )
+
+        # get_or_create is atomic on the server, so concurrent misses are harmless
+        collection = await self._async_client.get_or_create_collection(
+            name=self.get_collection_name(tenant_id),
+            metadata=self._collection_metadata(tenant_id),
+        )
+        self._async_collections[tenant_id] = collection
+        return collection
+
+    async def aadd_documents(
+        self,
+        tenant_id: str,
+        documents: List[str],
+        embeddings: Union[List[List[float]], np.ndarray],
+        metadatas: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Async variant of add_documents for request and ingestion paths.
+
+        Writes to pgvector for tenants in KB_PGVECTOR_TENANTS. Otherwise uses the
+        async Chroma client when CHROMA_HOST is set, or runs add_documents in a
+        worker thread.
+
+        Args:
+            tenant_id: Tenant identifier
+            documents: List of document texts
+            embeddings: Embedding vectors (list of lists or a 2-D array)
+            metadatas: List of metadata dictionaries
+            ids: Optional list of document IDs (defaults to content hashes)
+        """
+        if self._uses_pgvector(tenant_id):
+            ids, vectors, metadatas = self._prepare_rows(tenant_id, documents, embeddings, metadatas, ids)
+            for start in range(0, len(documents), BATCH_SIZE):
+                stop = start + BATCH_SIZE
+                await self._pgvector.add_documents(
+                    tenant_id, ids[start:stop], documents[start:stop],
+                    vectors[start:stop], metadatas[start:stop])
+            self._invalidate_queries(tenant_id)
+            logger.info("Added documents to vector store", tenant_id=tenant_id,
+                        count=len(documents), backend="pgvector")
+            return
+
+        if not self.async_mode:
+            await asyncio.to_thread(
+                self.add_documents, tenant_id, documents, embeddings, metadatas, ids)
+            return
+
+        collection = await self._get_async_collection(tenant_id)
+        ids, vectors, metadatas = self._prepare_rows(tenant_id, documents, embeddings, metadatas, ids)
+
+        for start in range(0, len(documents), BATCH_SIZE):
+            stop = start + BATCH_SIZE
+            await collection.upsert(
+                documents=documents[start:stop],
+                embeddings=vectors[start:stop],
+                metadatas=metadatas[start:stop],
+                ids=ids[start:stop],
+            )
+
+        self._invalidate_queries(tenant_id)
+
+        logger.info("Added documents to vector store", tenant_id=tenant_id, count=len(documents))
+
+    async def aquery(
+        self,
+        tenant_id: str,
+        query_embeddings: Union[List[float], List[List[float]], np.ndarray],
+        n_results: int = 3,
+        where: Optional[Dict[str, Any]] = None,
+        search_ef: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query for request paths.
+
+        Queries pgvector for tenants in KB_PGVECTOR_TENANTS. Otherwise uses the
+        async Chroma client when CHROMA_HOST is set, or runs query in a worker
+        thread.
+
+        Args:
+            tenant_id: Tenant identifier
+            query_embeddings: One query vector, or a batch of them (list of lists
+                or 2-D array) answered against the same index in one call
+            n_results: Number of results to return
+            where: Optional metadata filter
+            search_ef: Optional HNSW search breadth (pgvector tenants only)
+            max_distance: Optional cutoff; matches further away are dropped
+            min_similarity: Optional cosine similarity floor
+
+        Returns:
+            Dictionary with 'ids', 'documents', 'metadatas', 'distances'
+        """
+        pgvector = self._uses_pgvector(tenant_id)
+        if not self.async_mode and not pgvector:
+            return await asyncio.to_thread(
+                self.query, tenant_id, query_embeddings, n_results, where, search_ef,
+                max_distance, min_similarity)
+
+        max_distance = self._distance_cutoff(max_distance, min_similarity)
+        query_vector = _unit_rows(query_embeddings)
+        cache_key = self._query_cache_key(tenant_id, query_vector, n_results, where, search_ef)
+        now = time.monotonic()
+        cached = self._cached_query(cache_key, now)
+        if cached is not None:
+            logger.debug("Vector store query cache hit", tenant_id=tenant_id)
+            return self._within(cached, max_distance)
+
+        if pgvector:
+            results = await self._pgvector.query(
+                tenant_id, np.atleast_2d(query_vector), n_results, where, search_ef)
+            self._store_query(cache_key, now, results)
+            return self._within(results, max_distance)
+
+        collection = await self._get_async_collection(tenant_id)
+
+        results = await collection.query(
+            query_embeddings=np.atleast_2d(query_vector),
+            n_results=n_results,
+            where=self._scoped_where(tenant_id, where),
+        )
+
+        self._store_query(cache_key, now, results)
+        return self._within(results, max_distance)
+
+    def warmup(self, tenant_ids: Iterable[str]) -> None:
+        """
+        Load tenants' HNSW indexes ahead of their first query.
+
+        Runs one query per tenant using a stored vector, which also populates
+        the collection handle cache. Empty collections are skipped.
+
+        Args:
+            tenant_ids: Tenants to warm
+        """
+        for tenant_id in tenant_ids:
+            if self._uses_pgvector(tenant_id):
+                # Postgres keeps the index in shared buffers across restarts of this app
+                continue
+            try:
+                started = time.perf_counter()
+                collection = self.get_or_create_collection(tenant_id)
+                sample = collection.get(limit=1, include=["embeddings"])
+                embeddings = sample.get("embeddings")
+                if embeddings is None or len(embeddings) == 0:
+                    continue
+                collection.query(query_embeddings=np.atleast_2d(
+                    np.asarray(embeddings[0], dtype=np.float32)), n_results=1)
+                logger.info("Vector index warmed", tenant_id=tenant_id,
+                            duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            except Exception as e:
+                logger.warning("Vector index warmup failed", tenant_id=tenant_id, error=str(e))
 
     def delete_collection(self, tenant_id: str) -> None:
         """
@@ -131,31 +553,169 @@ class VectorStore:
         """
         try:
             collection_name = self.get_collection_name(tenant_id)
-            self.client.delete_collection(name=collection_name)
+            if self._is_shared(tenant_id):
+                # Other tenants live in the same collection; remove only this tenant's rows
+                self.get_or_create_collection(tenant_id).delete(where={"tenant_id": tenant_id})
+            else:
+                with self._collections_lock:
+                    self._collections.pop(tenant_id, None)
+                    self._async_collections.pop(tenant_id, None)
+                    self.client.delete_collection(name=collection_name)
+                    self._listed_at = float("-inf")
+            self._invalidate_queries(tenant_id)
             logger.info("Deleted collection", tenant_id=tenant_id, collection=collection_name)
         except Exception as e:
             logger.error("Failed to delete collection", tenant_id=tenant_id, error=str(e))
             raise
 
+    def _collection_names(self) -> set[str]:
+        """Collection names from a short-lived list_collections() snapshot."""
+        now = time.monotonic()
+        if now - self._listed_at > COLLECTION_LIST_TTL:
+            # Chroma < 0.6 returns Collection objects, later versions return names
+            self._listed_names = {
+                c if isinstance(c, str) else c.name for c in self.client.list_collections()
+            }
+            self._listed_at = now
+        return self._listed_names
+
+    def _collection_exists(self, name: str) -> bool:
+        """Existence check against the list_collections() snapshot."""
+        return name in self._collection_names()
+
+    def drop_if_empty(self, tenant_id: str) -> bool:
+        """
+        Delete a tenant's collection if it holds no documents.
+
+        Never creates the collection. Shared and pgvector tenants are skipped,
+        since their storage is not a collection of their own.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            True if a collection was deleted
+        """
+        if self._is_shared(tenant_id) or self._uses_pgvector(tenant_id):
+            return False
+
+        collection_name = self.get_collection_name(tenant_id)
+        if not self._collection_exists(collection_name):
+            return False
+
+        with self._collections_lock:
+            if self.client.get_collection(name=collection_name).count() > 0:
+                return False
+            self._collections.pop(tenant_id, None)
+            self._async_collections.pop(tenant_id, None)
+            self.client.delete_collection(name=collection_name)
+            self._listed_at = float("-inf")
+        self._invalidate_queries(tenant_id)
+        logger.info("Dropped empty collection", tenant_id=tenant_id, collection=collection_name)
+        return True
+
+    def drop_empty_collections(self) -> int:
+        """
+        Delete every empty per-tenant collection.
+
+        Empty collections still cost a sysdb entry and segment files, and slow
+        down listing and neighbouring collections' queries.
+
+        Returns:
+            Number of collections deleted
+        """
+        self._listed_at = float("-inf")
+        dropped = 0
+        for name in sorted(self._collection_names()):
+            if not name.startswith(TENANT_COLLECTION_PREFIX):
+                continue
+            try:
+                dropped += self.drop_if_empty(name[len(TENANT_COLLECTION_PREFIX):])
+            except Exception as e:
+                logger.warning("Failed to drop empty collection", collection=name, error=str(e))
+        return dropped
+
     def get_collection_stats(self, tenant_id: str) -> Dict[str, Any]:
         """
         Get statistics about a tenant's collection.
 
+        Never creates the collection: a tenant without one reports zero documents.
+
         Args:
             tenant_id: Tenant identifier
 
         Returns:
             Dictionary with collection statistics
         """
-        collection = self.get_or_create_collection(tenant_id)
-        count = collection.count()
+        collection_name = self.get_collection_name(tenant_id)
+        collection = self._collections.get(tenant_id)
+        if collection is None:
+            if not self._collection_exists(collection_name):
+                return {"tenant_id": tenant_id, "document_count": 0, "collection_name": collection_name}
+            collection = self.client.get_collection(name=collection_name)
+
+        if self._is_shared(tenant_id):
+            count = len(collection.get(where={"tenant_id": tenant_id}, include=[])["ids"])
+        else:
+            count = collection.count()
 
         return {
             "tenant_id": tenant_id,
             "document_count": count,
-            "collection_name": self.get_collection_name(tenant_id),
+            "collection_name": collection_name,
+        }
+
+    async def adelete_collection(self, tenant_id: str) -> None:
+        """
+        Async variant of delete_collection that also handles pgvector tenants.
+
+        Args:
+            tenant_id: Tenant identifier
+        """
+        if not self._uses_pgvector(tenant_id):
+            await asyncio.to_thread(self.delete_collection, tenant_id)
+            return
+
+        try:
+            await self._pgvector.delete(tenant_id)
+            self._invalidate_queries(tenant_id)
+            logger.info("Deleted collection", tenant_id=tenant_id, backend="pgvector")
+        except Exception as e:
+            logger.error("Failed to delete collection", tenant_id=tenant_id, error=str(e))
+            raise
+
+    async def aget_collection_stats(self, tenant_id: str) -> Dict[str, Any]:
+        """
+        Async variant of get_collection_stats that also handles pgvector tenants.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            Dictionary with collection statistics
+        """
+        if not self._uses_pgvector(tenant_id):
+            return await asyncio.to_thread(self.get_collection_stats, tenant_id)
+
+        return {
+            "tenant_id": tenant_id,
+            "document_count": await self._pgvector.count(tenant_id),
+            "collection_name": "pgvector",
         }
 
 
-vector_store = VectorStore()
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """
+    Get the process-wide vector store, created on first use.
+
+    Created lazily rather than at import so a forking server (e.g. gunicorn
+    with preload) never hands a parent's open SQLite connection to workers.
+    """
+    return VectorStore()
+
+
+# Each forked child opens its own Chroma client on first use
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=get_vector_store.cache_clear)
 